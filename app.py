@@ -7,6 +7,7 @@ Follows LLM_TECHNICAL_SPEC.md Section 12: Streamlit UI Specification
 import streamlit as st
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import traceback
@@ -102,7 +103,8 @@ def process_pdf(uploaded_file, progress_bar, status_text):
         status_text.text("📄 Step 1/6: Validating PDF...")
         progress_bar.progress(10)
 
-        pdf_data = st.session_state.pdf_service.process_pdf(str(pdf_path))
+        # Pages are rasterized lazily as OCR consumes them (bounded memory)
+        pdf_data = st.session_state.pdf_service.process_pdf(str(pdf_path), lazy=True)
         page_count = pdf_data["metadata"]["page_count"]
         file_size_mb = pdf_data["metadata"]["file_size_mb"]
 
@@ -115,7 +117,9 @@ def process_pdf(uploaded_file, progress_bar, status_text):
         status_text.text(f"🔍 Step 2/6: OCR Processing ({page_count} pages)...")
         progress_bar.progress(20)
 
-        ocr_results = st.session_state.ocr_service.process_pages(pdf_data["images"])
+        ocr_results = st.session_state.ocr_service.process_pages(
+            pdf_data["images"], total_pages=page_count
+        )
 
         progress_bar.progress(50)
 
@@ -138,7 +142,7 @@ def process_pdf(uploaded_file, progress_bar, status_text):
         progress_bar.progress(85)
 
         deduplicated_visits = st.session_state.dedup_service.deduplicate_document(
-            [visit.model_dump() if hasattr(visit, 'model_dump') else visit for visit in document.visits]
+            [visit.model_dump(mode="json") if hasattr(visit, 'model_dump') else visit for visit in document.visits]
         )
         document.visits = deduplicated_visits
         logger.info("Deduplication complete")
@@ -153,32 +157,35 @@ def process_pdf(uploaded_file, progress_bar, status_text):
 
         # Save canonical JSON
         json_path = output_dir / f"{base_name}_canonical.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            f.write(document.model_dump_json())
+        json_path.write_bytes(document.to_json_bytes())
 
         # Save OCR output
         ocr_path = output_dir / f"{base_name}_ocr.txt"
-        with open(ocr_path, "w", encoding="utf-8") as f:
-            for result in ocr_results:
-                f.write(f"\n{'=' * 80}\n")
-                f.write(f"PAGE {result['page_number']}\n")
-                f.write(f"{'=' * 80}\n\n")
-                f.write(result["raw_text"])
-                f.write("\n\n")
-
-        # Render XML
-        xml_path = output_dir / f"{base_name}_ccd.xml"
-        st.session_state.xml_renderer.render(document)
-        with open(xml_path, "w", encoding="utf-8") as f:
-            f.write(st.session_state.xml_renderer.render(document))
+        separator = "=" * 80
+        ocr_path.write_text(
+            "".join(
+                f"\n{separator}\nPAGE {result['page_number']}\n{separator}\n\n{result['raw_text']}\n\n"
+                for result in ocr_results
+            ),
+            encoding="utf-8",
+        )
 
-        # Render PDF
+        # Render XML, PDF and DOCX concurrently (read-only on document)
+        xml_path = output_dir / f"{base_name}_ccd.xml"
         pdf_output_path = output_dir / f"{base_name}_report.pdf"
-        st.session_state.pdf_renderer.render(document, str(pdf_output_path))
-
-        # Render DOCX
         docx_path = output_dir / f"{base_name}_report.docx"
-        st.session_state.docx_renderer.render(document, str(docx_path))
+        xml_renderer = st.session_state.xml_renderer
+        pdf_renderer = st.session_state.pdf_renderer
+        docx_renderer = st.session_state.docx_renderer
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            renders = [
+                executor.submit(xml_renderer.render_to_file, document, str(xml_path)),
+                executor.submit(pdf_renderer.render, document, str(pdf_output_path)),
+                executor.submit(docx_renderer.render, document, str(docx_path)),
+            ]
+            for future in renders:
+                future.result()
 
         progress_bar.progress(100)
         status_text.text("✅ Processing complete!")
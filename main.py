@@ -18,7 +18,15 @@ import argparse
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from statistics import fmean
+
+# Optional: faster JSON dumps (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from src.services.pdf_service import PDFService, PDFValidationError
 from src.services.ocr_service import OCRService, OCRError
@@ -29,10 +37,21 @@ from src.services.deduplication_service import DeduplicationService
 from src.renderers import XMLRenderer, PDFRenderer, DOCXRenderer
 from src.utils.config import get_config
 from src.utils.logger import get_logger
+from src.utils.prefetch import prefetch
 
 logger = get_logger(__name__)
 
 
+def write_debug_json(path: Path, data) -> None:
+    """Write a debug dump as indented UTF-8 JSON (orjson when installed)"""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    logger.info("Debug output saved", path=str(path))
+
+
 def process_medical_pdf(input_path: str, output_dir: str) -> dict:
     """Process medical PDF through complete pipeline
 
@@ -47,6 +66,7 @@ def process_medical_pdf(input_path: str, output_dir: str) -> dict:
         Various service-specific exceptions
     """
     start_time = time.time()
+    config = get_config()
 
     # Get base filename (without extension) for output naming
     input_file = Path(input_path)
@@ -63,156 +83,194 @@ def process_medical_pdf(input_path: str, output_dir: str) -> dict:
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # Step 1: PDF Validation and Ingestion
-    logger.info("-" * 60)
-    logger.info("STEP 1: PDF VALIDATION AND INGESTION")
-    logger.info("-" * 60)
-
-    pdf_service = PDFService()
-    pdf_data = pdf_service.process_pdf(input_path)
-
-    logger.info(
-        "PDF processing complete",
-        pages=pdf_data["metadata"]["page_count"],
-        file_size_mb=pdf_data["metadata"]["file_size_mb"],
-        warnings=len(pdf_data["warnings"]),
-    )
-
-    # Step 2: OCR (Vision-based text extraction)
-    logger.info("-" * 60)
-    logger.info("STEP 2: OCR (GEMINI 3 PRO PREVIEW - AGGRESSIVE EXTRACTION)")
-    logger.info("-" * 60)
-
-    ocr_service = OCRService()
-    ocr_results = ocr_service.process_pages(pdf_data["images"])
-
-    avg_confidence = sum(r["confidence_score"] for r in ocr_results) / len(ocr_results)
-    logger.info(
-        "OCR complete",
-        pages_processed=len(ocr_results),
-        avg_confidence=round(avg_confidence, 2),
-    )
-
-    # MILESTONE 1: Save combined raw OCR output (client deliverable)
-    logger.info("Saving combined raw OCR output (all pages)...")
-    ocr_output_file = output_path / f"{base_name}_ocr.txt"
-
-    with open(ocr_output_file, "w", encoding="utf-8") as f:
-        for result in ocr_results:
-            page_num = result["page_number"]
-            # Write page separator
-            f.write(f"\n{'=' * 80}\n")
-            f.write(f"PAGE {page_num}\n")
-            f.write(f"{'=' * 80}\n\n")
-            # Write OCR text
-            f.write(result["raw_text"])
-            f.write("\n\n")
-
-    logger.info(f"  • Combined OCR saved: {ocr_output_file.name}")
-
-    # Save OCR results summary (debug)
-    if get_config().debug:
-        ocr_output_path = output_path / f"{base_name}_debug_ocr_results.json"
-        with open(ocr_output_path, "w", encoding="utf-8") as f:
-            json.dump(ocr_results, f, indent=2, ensure_ascii=False)
-        logger.info("OCR debug output saved", path=str(ocr_output_path))
-
-    # Step 3: Chunking (Visit detection)
-    logger.info("-" * 60)
-    logger.info("STEP 3: CHUNKING (VISIT DETECTION)")
-    logger.info("-" * 60)
-
-    chunking_service = ChunkingService()
-    chunks = chunking_service.chunk_pages(ocr_results)
-
-    logger.info(
-        "Chunking complete",
-        visits_detected=len(chunks),
-        avg_pages_per_visit=sum(len(c["pages"]) for c in chunks) / len(chunks) if chunks else 0,
-    )
-
-    # Save chunks (debug)
-    if get_config().debug:
-        chunks_output_path = output_path / f"{base_name}_debug_chunks.json"
-        # Remove raw_text for brevity
-        chunks_clean = [
-            {k: v for k, v in c.items() if k != "raw_text"}
-            for c in chunks
-        ]
-        with open(chunks_output_path, "w", encoding="utf-8") as f:
-            json.dump(chunks_clean, f, indent=2, ensure_ascii=False)
-        logger.info("Chunks debug output saved", path=str(chunks_output_path))
-
-    # Step 4: Structuring (Canonical JSON)
-    logger.info("-" * 60)
-    logger.info("STEP 4: STRUCTURING (GEMINI 2.5 FLASH → CANONICAL JSON)")
-    logger.info("-" * 60)
-
-    structuring_service = StructuringService()
-    medical_document = structuring_service.structure_document(chunks, ocr_results)
-
-    # Add processing duration
-    processing_duration_ms = int((time.time() - start_time) * 1000)
-    medical_document.processing_duration_ms = processing_duration_ms
-
-    logger.info(
-        "Structuring complete",
-        visits=len(medical_document.visits),
-        confidence=medical_document.ocr_confidence_avg,
-        processing_time_sec=round(processing_duration_ms / 1000, 1),
-    )
-
-    # Step 5: Deduplication & Merge (Milestone 2)
-    logger.info("-" * 60)
-    logger.info("STEP 5: DEDUPLICATION & MERGE")
-    logger.info("-" * 60)
-
-    deduplication_service = DeduplicationService(fuzzy_threshold=0.85)
-    deduplicated_visits = deduplication_service.deduplicate_document(
-        [visit.model_dump() if hasattr(visit, 'model_dump') else visit for visit in medical_document.visits]
-    )
-    medical_document.visits = deduplicated_visits
-
-    logger.info("Deduplication complete")
-
-    # Step 6: Save Canonical JSON
-    logger.info("-" * 60)
-    logger.info("STEP 6: SAVE CANONICAL JSON (SOURCE OF TRUTH)")
-    logger.info("-" * 60)
-
-    # Save canonical JSON with PDF filename
-    canonical_output_path = output_path / f"{base_name}_canonical.json"
-    with open(canonical_output_path, "w", encoding="utf-8") as f:
-        f.write(medical_document.model_dump_json())  # Model already has indent=2
-    logger.info("Canonical JSON saved", path=str(canonical_output_path))
-
-    # Step 7: Render Outputs (Milestone 2)
-    logger.info("-" * 60)
-    logger.info("STEP 7: RENDER OUTPUTS (XML, PDF, DOCX)")
-    logger.info("-" * 60)
-
-    # Render XML (CCD/CCDA-style)
-    logger.info("Rendering CCD/CCDA XML...")
-    xml_renderer = XMLRenderer()
-    xml_output_path = output_path / f"{base_name}_ccd.xml"
-    xml_content = xml_renderer.render(medical_document)
-    with open(xml_output_path, "w", encoding="utf-8") as f:
-        f.write(xml_content)
-    logger.info(f"  • CCD/CCDA XML saved: {xml_output_path.name}")
-
-    # Render PDF (Human-readable)
-    logger.info("Rendering human-readable PDF...")
-    pdf_renderer = PDFRenderer()
-    pdf_output_path = output_path / f"{base_name}_report.pdf"
-    pdf_renderer.render(medical_document, str(pdf_output_path))
-    logger.info(f"  • Human-readable PDF saved: {pdf_output_path.name}")
-
-    # Render DOCX (Editable)
-    logger.info("Rendering editable DOCX...")
-    docx_renderer = DOCXRenderer()
-    docx_output_path = output_path / f"{base_name}_report.docx"
-    docx_renderer.render(medical_document, str(docx_output_path))
-    logger.info(f"  • Editable DOCX saved: {docx_output_path.name}")
+    # Construct the later-stage services (API clients, caches, renderer
+    # styles) in the background while the PDF is validated and rasterized;
+    # each step collects its service with .result(), which re-raises any
+    # construction error at that step
+    warmup = ThreadPoolExecutor(max_workers=4)
+    try:
+        services = {
+            "ocr": warmup.submit(OCRService),
+            "chunking": warmup.submit(ChunkingService),
+            "structuring": warmup.submit(StructuringService),
+            "deduplication": warmup.submit(DeduplicationService, fuzzy_threshold=0.85),
+            "xml": warmup.submit(XMLRenderer),
+            "pdf": warmup.submit(PDFRenderer),
+            "docx": warmup.submit(DOCXRenderer),
+        }
+    finally:
+        # Queued constructions still run; only stop accepting new work
+        warmup.shutdown(wait=False)
+
+    # Output files the pipeline does not read back are written on a
+    # background thread while later steps run; collected before returning
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        pending_writes = []
+
+        # Step 1: PDF Validation and Ingestion
+        logger.info("-" * 60)
+        logger.info("STEP 1: PDF VALIDATION AND INGESTION")
+        logger.info("-" * 60)
+
+        pdf_service = PDFService()
+        pdf_data = pdf_service.process_pdf(input_path, lazy=True)
+        page_count = pdf_data["metadata"]["page_count"]
+
+        logger.info(
+            "PDF validation complete",
+            pages=page_count,
+            file_size_mb=pdf_data["metadata"]["file_size_mb"],
+        )
+
+        # Step 2: OCR (Vision-based text extraction)
+        logger.info("-" * 60)
+        logger.info("STEP 2: OCR (GEMINI 3 PRO PREVIEW - AGGRESSIVE EXTRACTION)")
+        logger.info("-" * 60)
+
+        # Pages are rasterized on a background thread, a bounded number ahead of
+        # OCR, so the first OCR call starts while later pages are still rendering
+        page_images = prefetch(pdf_data["images"], maxsize=config.ocr_prefetch_pages)
+
+        ocr_service = services["ocr"].result()
+        ocr_results = ocr_service.process_pages(page_images, total_pages=page_count)
+
+        avg_confidence = fmean(r["confidence_score"] for r in ocr_results) if ocr_results else 0.0
+        logger.info(
+            "OCR complete",
+            pages_processed=len(ocr_results),
+            page_warnings=len(pdf_data["warnings"]),
+            avg_confidence=round(avg_confidence, 2),
+        )
+
+        # MILESTONE 1: Save combined raw OCR output (client deliverable)
+        logger.info("Saving combined raw OCR output (all pages)...")
+        ocr_output_file = output_path / f"{base_name}_ocr.txt"
+
+        def write_combined_ocr():
+            # Page separator, then OCR text; joined in memory and written once
+            separator = "=" * 80
+            ocr_output_file.write_text(
+                "".join(
+                    f"\n{separator}\nPAGE {result['page_number']}\n{separator}\n\n{result['raw_text']}\n\n"
+                    for result in ocr_results
+                ),
+                encoding="utf-8",
+            )
+            logger.info(f"  • Combined OCR saved: {ocr_output_file.name}")
+
+        pending_writes.append(writer.submit(write_combined_ocr))
+
+        # Save OCR results summary (debug)
+        if config.debug:
+            ocr_output_path = output_path / f"{base_name}_debug_ocr_results.json"
+            pending_writes.append(writer.submit(write_debug_json, ocr_output_path, ocr_results))
+
+        # Step 3: Chunking (Visit detection)
+        logger.info("-" * 60)
+        logger.info("STEP 3: CHUNKING (VISIT DETECTION)")
+        logger.info("-" * 60)
+
+        chunking_service = services["chunking"].result()
+        chunks = chunking_service.chunk_pages(ocr_results)
+
+        logger.info(
+            "Chunking complete",
+            visits_detected=len(chunks),
+            avg_pages_per_visit=fmean(len(c["pages"]) for c in chunks) if chunks else 0,
+        )
+
+        # Save chunks (debug)
+        if config.debug:
+            chunks_output_path = output_path / f"{base_name}_debug_chunks.json"
+            # Remove raw_text for brevity (shallow copies; chunks are not modified)
+            chunks_clean = []
+            for c in chunks:
+                chunk_clean = {**c}
+                chunk_clean.pop("raw_text", None)
+                chunks_clean.append(chunk_clean)
+            pending_writes.append(writer.submit(write_debug_json, chunks_output_path, chunks_clean))
+
+        # Step 4: Structuring (Canonical JSON)
+        logger.info("-" * 60)
+        logger.info("STEP 4: STRUCTURING (GEMINI 2.5 FLASH → CANONICAL JSON)")
+        logger.info("-" * 60)
+
+        structuring_service = services["structuring"].result()
+        medical_document = structuring_service.structure_document(chunks, ocr_results)
+
+        # Add processing duration
+        processing_duration_ms = int((time.time() - start_time) * 1000)
+        medical_document.processing_duration_ms = processing_duration_ms
+
+        logger.info(
+            "Structuring complete",
+            visits=len(medical_document.visits),
+            confidence=medical_document.ocr_confidence_avg,
+            processing_time_sec=round(processing_duration_ms / 1000, 1),
+        )
+
+        # Step 5: Deduplication & Merge (Milestone 2)
+        logger.info("-" * 60)
+        logger.info("STEP 5: DEDUPLICATION & MERGE")
+        logger.info("-" * 60)
+
+        deduplication_service = services["deduplication"].result()
+        deduplicated_visits = deduplication_service.deduplicate_document(
+            [visit.model_dump(mode="json") if hasattr(visit, 'model_dump') else visit for visit in medical_document.visits]
+        )
+        medical_document.visits = deduplicated_visits
+
+        logger.info("Deduplication complete")
+
+        # Step 6: Save Canonical JSON
+        logger.info("-" * 60)
+        logger.info("STEP 6: SAVE CANONICAL JSON (SOURCE OF TRUTH)")
+        logger.info("-" * 60)
+
+        # Save canonical JSON with PDF filename
+        canonical_output_path = output_path / f"{base_name}_canonical.json"
+        def write_canonical_json():
+            canonical_output_path.write_bytes(medical_document.to_json_bytes())  # Same indent=2 layout as model_dump_json
+            logger.info("Canonical JSON saved", path=str(canonical_output_path))
+
+        # Rendering only reads medical_document, so it proceeds alongside the write
+        pending_writes.append(writer.submit(write_canonical_json))
+
+        # Step 7: Render Outputs (Milestone 2)
+        logger.info("-" * 60)
+        logger.info("STEP 7: RENDER OUTPUTS (XML, PDF, DOCX)")
+        logger.info("-" * 60)
+
+        xml_output_path = output_path / f"{base_name}_ccd.xml"
+        pdf_output_path = output_path / f"{base_name}_report.pdf"
+        docx_output_path = output_path / f"{base_name}_report.docx"
+
+        def write_xml():
+            xml_content = services["xml"].result().render(medical_document)
+            with open(xml_output_path, "w", encoding="utf-8") as f:
+                f.write(xml_content)
+
+        # The renderers only read medical_document and each writes its own file,
+        # so render all three formats concurrently. Threads, not processes: the
+        # XML and PDF renderers wait on Gemini, leaving the GIL to DOCX, and a
+        # spawned worker's ~1s start-up exceeds DOCX render time (~15ms per visit)
+        logger.info("Rendering CCD/CCDA XML, human-readable PDF and editable DOCX...")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            renders = {
+                executor.submit(write_xml):
+                    f"CCD/CCDA XML saved: {xml_output_path.name}",
+                executor.submit(services["pdf"].result().render, medical_document, str(pdf_output_path)):
+                    f"Human-readable PDF saved: {pdf_output_path.name}",
+                executor.submit(services["docx"].result().render, medical_document, str(docx_output_path)):
+                    f"Editable DOCX saved: {docx_output_path.name}",
+            }
+            for future in as_completed(renders):
+                future.result()
+                logger.info(f"  • {renders[future]}")
+
+        # Wait for the background writes; re-raises any write error
+        for future in pending_writes:
+            future.result()
 
     # Summary
     logger.info("=" * 60)
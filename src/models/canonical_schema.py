@@ -6,11 +6,18 @@ All outputs (XML, PDF, DOCX) MUST be rendered from these models only.
 Schema Version: 2.0
 """
 
+import json
 from datetime import date, datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+# Optional: faster JSON export (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .enums import (
     AbnormalFlag,
     DocumentType,
@@ -299,6 +306,29 @@ class MedicalDocument(BaseModel):
             **kwargs
         )
 
+    def to_json_dict(self) -> dict:
+        """Export to a JSON-compatible dict (ISO dates, enum values)
+
+        Visits already held as JSON-mode dicts (deduplication swaps the Visit
+        models for plain dicts) are used as-is rather than serialized again.
+        """
+        data = self.model_dump(mode="json", exclude={"visits"})
+        visits = [
+            visit.model_dump(mode="json") if isinstance(visit, BaseModel) else visit
+            for visit in self.visits
+        ]
+        return {name: visits if name == "visits" else data[name] for name in type(self).model_fields}
+
+    def to_json_bytes(self) -> bytes:
+        """Export to UTF-8 JSON bytes, same layout as model_dump_json()
+
+        Uses orjson when installed (faster on large visit lists), otherwise
+        the standard library encoder.
+        """
+        if orjson is not None:
+            return orjson.dumps(self.to_json_dict(), option=orjson.OPT_INDENT_2)
+        return json.dumps(self.to_json_dict(), indent=2, ensure_ascii=False).encode("utf-8")
+
 
 
 
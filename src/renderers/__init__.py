@@ -1,8 +1,22 @@
 """Renderers for converting canonical JSON to various output formats"""
 
-# Use LLM-based renderers for both XML and PDF
-from .xml_renderer_llm import XMLRenderer
-from .pdf_renderer_llm import PDFRenderer
-from .docx_renderer import DOCXRenderer
+from importlib import import_module
+
+# Use LLM-based renderers for both XML and PDF. Resolved on first access so
+# importing one renderer module (e.g. the client-format pdf_renderer) does not
+# pull in google.generativeai through this package.
+_EXPORTS = {
+    "XMLRenderer": ".xml_renderer_llm",
+    "PDFRenderer": ".pdf_renderer_llm",
+    "DOCXRenderer": ".docx_renderer",
+}
 
 __all__ = ["XMLRenderer", "PDFRenderer", "DOCXRenderer"]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -8,11 +8,12 @@ NO data extraction logic allowed here.
 """
 
 from datetime import datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
 from typing import Dict, Any, List
-from io import BytesIO
 
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.platypus import (
@@ -31,70 +32,85 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Document type keyword -> subtitle specialty; first match wins
+SPECIALTY_BY_KEYWORD = {
+    "endo": "Endocrinology",
+    "cardio": "Cardiology",
+    # Add more specialty mappings as needed
+}
+
+
+@lru_cache(maxsize=None)
+def _build_styles() -> StyleSheet1:
+    """Sample stylesheet plus the client-format paragraph styles
+
+    Built once and shared, read-only, by every renderer instance.
+    """
+    styles = getSampleStyleSheet()
+
+    # Main title style
+    styles.add(ParagraphStyle(
+        name='MainTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.black,
+        spaceAfter=4,
+        alignment=TA_LEFT,
+        fontName='Helvetica-Bold',
+    ))
+
+    # Subtitle style
+    styles.add(ParagraphStyle(
+        name='Subtitle',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.black,
+        spaceAfter=10,
+        alignment=TA_LEFT,
+        fontName='Helvetica',
+    ))
+
+    # Section heading (bold, left-aligned)
+    styles.add(ParagraphStyle(
+        name='SectionHeading',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.black,
+        spaceBefore=10,
+        spaceAfter=4,
+        fontName='Helvetica-Bold',
+    ))
+
+    # Normal body text
+    styles.add(ParagraphStyle(
+        name='ClientBodyText',
+        parent=styles['Normal'],
+        fontSize=11,
+        textColor=colors.black,
+        spaceAfter=8,
+        leading=14,
+    ))
+
+    # Footer note style
+    styles.add(ParagraphStyle(
+        name='FooterNote',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=colors.HexColor('#666666'),
+        spaceBefore=20,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Oblique',
+    ))
+
+    return styles
+
 
 class PDFRenderer:
     """Render canonical JSON to client's Specialist Consult Summary PDF format"""
 
     def __init__(self):
         logger.info("PDF renderer initialized (Client format)")
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles matching client's format"""
-        # Main title style
-        self.styles.add(ParagraphStyle(
-            name='MainTitle',
-            parent=self.styles['Heading1'],
-            fontSize=16,
-            textColor=colors.black,
-            spaceAfter=4,
-            alignment=TA_LEFT,
-            fontName='Helvetica-Bold',
-        ))
-
-        # Subtitle style
-        self.styles.add(ParagraphStyle(
-            name='Subtitle',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.black,
-            spaceAfter=10,
-            alignment=TA_LEFT,
-            fontName='Helvetica',
-        ))
-
-        # Section heading (bold, left-aligned)
-        self.styles.add(ParagraphStyle(
-            name='SectionHeading',
-            parent=self.styles['Heading3'],
-            fontSize=12,
-            textColor=colors.black,
-            spaceBefore=10,
-            spaceAfter=4,
-            fontName='Helvetica-Bold',
-        ))
-
-        # Normal body text
-        self.styles.add(ParagraphStyle(
-            name='ClientBodyText',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=colors.black,
-            spaceAfter=8,
-            leading=14,
-        ))
-
-        # Footer note style
-        self.styles.add(ParagraphStyle(
-            name='FooterNote',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#666666'),
-            spaceBefore=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Oblique',
-        ))
+        self.styles = _build_styles()
 
     def render(self, document: MedicalDocument, output_path: str) -> str:
         """Render MedicalDocument to client's Specialist Consult Summary PDF
@@ -162,11 +178,10 @@ class PDFRenderer:
         specialty = "Medical Consult"
         if document.document_metadata.document_type:
             doc_type = str(document.document_metadata.document_type).lower()
-            if "endo" in doc_type:
-                specialty = "Endocrinology"
-            elif "cardio" in doc_type:
-                specialty = "Cardiology"
-            # Add more specialty mappings as needed
+            specialty = next(
+                (name for keyword, name in SPECIALTY_BY_KEYWORD.items() if keyword in doc_type),
+                specialty,
+            )
 
         story.append(Paragraph(f"Specialist Consult Summary – {specialty}", self.styles['Subtitle']))
         story.append(Spacer(1, 0.15*inch))
@@ -231,11 +246,13 @@ class PDFRenderer:
 
         story.append(Paragraph("Problem List (Summary)", self.styles['SectionHeading']))
 
+        lines = []
         for problem in problems:
-            problem_text = f"• {problem.get('problem', '')}"
+            problem_text = problem.get('problem', '')
             if problem.get("status"):
                 problem_text += f" ({problem['status']})"
-            story.append(Paragraph(problem_text, self.styles['ClientBodyText']))
+            lines.append(problem_text)
+        self._add_bullets(story, lines)
 
         story.append(Spacer(1, 0.05*inch))
 
@@ -248,12 +265,13 @@ class PDFRenderer:
         story.append(Paragraph("Results / Relevant Data", self.styles['SectionHeading']))
 
         # Format results as bullets
+        lines = []
         for result in results:
             test_name = result.get("test_name", "Unknown test")
             value = result.get("value", "N/A")
             unit = result.get("unit", "")
 
-            result_text = f"• {test_name}: {value}"
+            result_text = f"{test_name}: {value}"
             if unit:
                 result_text += f" {unit}"
 
@@ -261,18 +279,19 @@ class PDFRenderer:
             if result.get("abnormal_flag") and result["abnormal_flag"] != "normal":
                 result_text += f" ({result['abnormal_flag']})"
 
-            story.append(Paragraph(result_text, self.styles['ClientBodyText']))
+            lines.append(result_text)
 
         # Add relevant vital signs if present
         vital_signs = visit.get("vital_signs", {})
         if vital_signs:
             for vital_name, vital_data in vital_signs.items():
                 if isinstance(vital_data, dict) and vital_data.get("value"):
-                    vital_text = f"• {vital_name.replace('_', ' ').title()}: {vital_data['value']}"
+                    vital_text = f"{vital_name.replace('_', ' ').title()}: {vital_data['value']}"
                     if vital_data.get("unit"):
                         vital_text += f" {vital_data['unit']}"
-                    story.append(Paragraph(vital_text, self.styles['ClientBodyText']))
+                    lines.append(vital_text)
 
+        self._add_bullets(story, lines)
         story.append(Spacer(1, 0.05*inch))
 
     def _add_plan_client(self, story: List, plan: List[Dict[str, Any]]):
@@ -282,12 +301,21 @@ class PDFRenderer:
 
         story.append(Paragraph("Plan", self.styles['SectionHeading']))
 
-        for item in plan:
-            plan_text = f"• {item.get('action', '')}"
-            story.append(Paragraph(plan_text, self.styles['ClientBodyText']))
+        self._add_bullets(story, [item.get('action', '') for item in plan])
 
         story.append(Spacer(1, 0.05*inch))
 
+    def _add_bullets(self, story: List, lines: List[str]):
+        """Add bullet lines as a single Paragraph
+
+        One flowable (and one markup parse) per section instead of one per
+        item; item text is escaped so OCR'd "<" or "&" cannot break the markup.
+        """
+        story.append(Paragraph(
+            "<br/>".join(f"• {escape(str(line))}" for line in lines),
+            self.styles['ClientBodyText'],
+        ))
+
     def _add_footer_note(self, story: List):
         """Add client's exact footer note"""
         footer_text = "Note: Human-readable CCD-style summary for upload/viewing. For standards-based exchange, use CCDA/CCD XML"
@@ -6,12 +6,13 @@ from raw OCR text, then renders to PDF using ReportLab.
 
 import google.generativeai as genai
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
@@ -361,13 +362,94 @@ Generate the complete clinical summary now following this exact structure.
 """
 
 
+@lru_cache(maxsize=None)
+def _build_styles() -> StyleSheet1:
+    """Sample stylesheet plus the summary PDF's paragraph styles
+
+    Built once and shared, read-only, by every render.
+    """
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        textColor=colors.HexColor('#1f77b4'),
+        spaceAfter=6,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=12,
+        textColor=colors.HexColor('#2c3e50'),
+        spaceBefore=12,
+        spaceAfter=6,
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='CustomBody',
+        parent=styles['BodyText'],
+        fontSize=10,
+        leading=14,
+        spaceAfter=8,
+        alignment=TA_JUSTIFY
+    ))
+    styles.add(ParagraphStyle(
+        name='Footer',
+        parent=styles['BodyText'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    ))
+    return styles
+
+
+GENERATION_CONFIG = genai.GenerationConfig(
+    temperature=0.2,  # Slightly creative for better formatting
+    top_p=0.95,
+    top_k=40,
+    max_output_tokens=8192,
+)
+
+SAFETY_SETTINGS = [
+    {
+        "category": HarmCategory.HARM_CATEGORY_HARASSMENT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+]
+
+
+@lru_cache(maxsize=None)
+def _get_model(model_name: str, api_key: str) -> genai.GenerativeModel:
+    """Configured Gemini model, shared by every renderer in the process
+
+    The summary prompt is bound as the system instruction, so each request
+    only carries the OCR text. Keyed on the API key so a changed key still
+    reconfigures the client.
+    """
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name, system_instruction=CLINICAL_SUMMARY_PROMPT)
+
+
 class PDFRenderer:
     """Render MedicalDocument to human-readable PDF using LLM-generated summary"""
 
     def __init__(self):
         self.config = get_config()
-        genai.configure(api_key=self.config.gemini_api_key)
-        self.model = genai.GenerativeModel(self.config.structuring_model_name)
+        self.model = _get_model(self.config.structuring_model_name, self.config.gemini_api_key)
         logger.info("PDF renderer initialized (LLM-based)")
 
     def render(self, document: MedicalDocument, output_path: str) -> None:
@@ -384,6 +466,10 @@ class PDFRenderer:
             if document.raw_ocr_text:
                 logger.info("Using raw OCR text for summary generation (preferred)")
                 clinical_summary = self._generate_summary_from_ocr(document.raw_ocr_text)
+                if not clinical_summary:
+                    # Empty or blocked replies would render a blank PDF
+                    logger.warning("LLM returned an empty summary, generating from canonical JSON")
+                    clinical_summary = self._generate_summary_from_json(document)
             else:
                 logger.info("No raw OCR text available, generating from canonical JSON")
                 clinical_summary = self._generate_summary_from_json(document)
@@ -400,56 +486,37 @@ class PDFRenderer:
     def _generate_summary_from_ocr(self, ocr_text: str) -> str:
         """Generate clinical summary from raw OCR text using LLM"""
 
-        prompt = f"""{CLINICAL_SUMMARY_PROMPT}
-
----
-
-INPUT DATA (RAW OCR TEXT):
+        prompt = f"""INPUT DATA (RAW OCR TEXT):
 
 {ocr_text}
 
 ---
 
-Generate the complete human-readable clinical summary now. Use the exact format shown above.
+Generate the complete human-readable clinical summary now. Use the exact format from your instructions.
 """
 
         logger.info("Calling LLM for clinical summary generation...")
 
         response = self.model.generate_content(
             prompt,
-            generation_config=genai.GenerationConfig(
-                temperature=0.2,  # Slightly creative for better formatting
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=8192,
-            ),
-            safety_settings=[
-                {
-                    "category": HarmCategory.HARM_CATEGORY_HARASSMENT,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-            ],
+            generation_config=GENERATION_CONFIG,
+            safety_settings=SAFETY_SETTINGS,
         )
 
-        summary = response.text.strip()
+        try:
+            summary = response.text.strip()
+        except ValueError:
+            # No text parts, e.g. the reply was blocked by a safety filter
+            logger.warning("LLM reply has no text", prompt_feedback=str(getattr(response, "prompt_feedback", "")))
+            return ""
 
         # Remove markdown code blocks if present
         if summary.startswith("```"):
-            summary = summary.split("\n", 1)[1]
+            summary = summary[summary.find("\n") + 1:]
         if summary.endswith("```"):
-            summary = summary.rsplit("\n", 1)[0]
+            last_newline = summary.rfind("\n")
+            if last_newline >= 0:
+                summary = summary[:last_newline]
 
         return summary.strip()
 
@@ -481,42 +548,16 @@ Generate the complete human-readable clinical summary now. Use the exact format
             bottomMargin=0.75*inch
         )
 
-        # Setup styles
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#1f77b4'),
-            spaceAfter=6,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-        styles.add(ParagraphStyle(
-            name='CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=12,
-            textColor=colors.HexColor('#2c3e50'),
-            spaceBefore=12,
-            spaceAfter=6,
-            fontName='Helvetica-Bold'
-        ))
-        styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=styles['BodyText'],
-            fontSize=10,
-            leading=14,
-            spaceAfter=8,
-            alignment=TA_JUSTIFY
-        ))
+        styles = _build_styles()
+        heading_style = styles['CustomHeading']
+        title_style = styles['CustomTitle']
+        body_style = styles['CustomBody']
 
         # Build content
         story = []
 
         # Parse and format summary
-        lines = summary_text.split('\n')
-
-        for line in lines:
+        for line in summary_text.split('\n'):
             line = line.strip()
             if not line:
                 story.append(Spacer(1, 0.1*inch))
@@ -524,27 +565,20 @@ Generate the complete human-readable clinical summary now. Use the exact format
 
             # Check if this is a major section header (all caps)
             if line.isupper() and len(line) > 3 and not line.startswith('•'):
-                story.append(Paragraph(line, styles['CustomHeading']))
+                story.append(Paragraph(line, heading_style))
             # Check if title line
             elif 'CONTINUITY OF CARE' in line or 'Specialist Consult' in line:
-                story.append(Paragraph(line, styles['CustomTitle']))
+                story.append(Paragraph(line, title_style))
             # Regular content
             else:
-                story.append(Paragraph(line, styles['CustomBody']))
+                story.append(Paragraph(line, body_style))
 
         # Add footer
         story.append(Spacer(1, 0.3*inch))
-        footer_style = ParagraphStyle(
-            name='Footer',
-            parent=styles['BodyText'],
-            fontSize=8,
-            textColor=colors.grey,
-            alignment=TA_CENTER
-        )
         story.append(Paragraph(
             "This document was generated from OCR-processed medical records. "
             "Please verify critical information with original source documents.",
-            footer_style
+            styles['Footer']
         ))
 
         # Build PDF
@@ -8,16 +8,25 @@ NO data extraction logic allowed here.
 """
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from xml.etree.ElementTree import Element, SubElement, tostring, ElementTree
-from xml.dom import minidom
+from typing import Dict, Any, Iterable, List, Optional
+from xml.sax.saxutils import escape
 import re
 
+# lxml is preferred; the stdlib ElementTree API is a drop-in fallback
+try:
+    from lxml.etree import Element, SubElement, fromstring, indent, tostring
+    USING_LXML = True
+except ImportError:
+    from xml.etree.ElementTree import Element, SubElement, fromstring, tostring, indent
+    USING_LXML = False
+
 from ..models.canonical_schema import MedicalDocument
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
 
 class XMLRenderer:
     """Render canonical JSON to CCD/CCDA-style XML"""
@@ -26,6 +35,7 @@ class XMLRenderer:
     HL7_NAMESPACE = "urn:hl7-org:v3"
     LOINC_SYSTEM = "2.16.840.1.113883.6.1"
     GENDER_CODE_SYSTEM = "2.16.840.1.113883.5.1"
+    GENDER_CODES = {"male": "M", "female": "F", "m": "M", "f": "F"}
     ROOT_OID = "2.16.840.1.113883.1.3"
 
     def __init__(self):
@@ -44,8 +54,7 @@ class XMLRenderer:
 
         try:
             # Create root element
-            root = Element("ClinicalDocument")
-            root.set("xmlns", self.HL7_NAMESPACE)
+            root = self._new_root()
 
             # Add header elements
             self._add_realm_code(root)
@@ -68,6 +77,64 @@ class XMLRenderer:
             logger.error("XML rendering failed", error=str(e))
             raise RenderError(f"Failed to render XML: {e}")
 
+    def render_to_file(self, document: MedicalDocument, output_path: str) -> str:
+        """Stream MedicalDocument to a CCD/CCDA XML file
+
+        The header is written first, then each visit section is built,
+        serialized and written on its own, so peak memory is one visit rather
+        than the whole tree plus its serialized copy. The file content is the
+        same as render() output.
+
+        Args:
+            document: Validated MedicalDocument instance
+            output_path: Path to save XML file
+
+        Returns:
+            Path to saved XML file
+        """
+        logger.info("Streaming document to XML", visits=len(document.visits))
+
+        try:
+            header = Element("ClinicalDocument")
+            self._add_realm_code(header)
+            self._add_type_id(header)
+            self._add_document_metadata(header, document)
+            self._add_patient_demographics(header, document)
+
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(XML_DECLARATION)
+                f.write(f'<ClinicalDocument xmlns="{self.HL7_NAMESPACE}">\n')
+                for elem in header:
+                    self._write_element(f, elem, level=1)
+
+                if not document.visits:
+                    component = Element("component")
+                    SubElement(component, "structuredBody")
+                    self._write_element(f, component, level=1)
+                else:
+                    f.write("  <component>\n    <structuredBody>\n")
+                    for visit in document.visits:
+                        holder = Element("structuredBody")
+                        self._add_visit_section(holder, visit)
+                        for elem in holder:
+                            self._write_element(f, elem, level=3)
+                    f.write("    </structuredBody>\n  </component>\n")
+
+                f.write("</ClinicalDocument>\n")
+
+            logger.info("XML streaming complete", output_path=output_path)
+            return output_path
+
+        except Exception as e:
+            logger.error("XML streaming failed", error=str(e))
+            raise RenderError(f"Failed to render XML: {e}")
+
+    @staticmethod
+    def _write_element(f, elem: Element, level: int):
+        """Write one pretty-printed element at the given nesting depth"""
+        indent(elem, space="  ", level=level)
+        f.write(f"{'  ' * level}{tostring(elem, encoding='unicode')}\n")
+
     def _add_realm_code(self, root: Element):
         """Add realm code (US)"""
         realm = SubElement(root, "realmCode")
@@ -104,13 +171,14 @@ class XMLRenderer:
 
     def _add_patient_demographics(self, root: Element, document: MedicalDocument):
         """Add patient demographics section"""
+        metadata = document.document_metadata
         record_target = SubElement(root, "recordTarget")
         patient_role = SubElement(record_target, "patientRole")
 
         # Patient ID
-        if document.document_metadata.patient_id:
+        if metadata.patient_id:
             patient_id = SubElement(patient_role, "id")
-            patient_id.set("extension", str(document.document_metadata.patient_id))
+            patient_id.set("extension", str(metadata.patient_id))
             patient_id.set("root", "2.16.840.1.113883.3.1")
         else:
             patient_id = SubElement(patient_role, "id")
@@ -120,9 +188,9 @@ class XMLRenderer:
         patient = SubElement(patient_role, "patient")
 
         # Name
-        if document.document_metadata.patient_name:
+        if metadata.patient_name:
             name = SubElement(patient, "name")
-            name_parts = self._parse_name(document.document_metadata.patient_name)
+            name_parts = self._parse_name(metadata.patient_name)
             if name_parts.get("given"):
                 given = SubElement(name, "given")
                 given.text = name_parts["given"]
@@ -134,9 +202,10 @@ class XMLRenderer:
             name.set("nullFlavor", "UNK")
 
         # Date of birth
-        if document.document_metadata.dob:
+        dob = metadata.dob
+        if dob:
             birth_time = SubElement(patient, "birthTime")
-            dob_str = document.document_metadata.dob.strftime("%Y%m%d") if hasattr(document.document_metadata.dob, 'strftime') else str(document.document_metadata.dob).replace("-", "")
+            dob_str = dob.strftime("%Y%m%d") if hasattr(dob, 'strftime') else str(dob).replace("-", "")
             birth_time.set("value", dob_str)
         else:
             birth_time = SubElement(patient, "birthTime")
@@ -144,9 +213,8 @@ class XMLRenderer:
 
         # Gender
         gender_code = SubElement(patient, "administrativeGenderCode")
-        if document.document_metadata.sex:
-            sex_map = {"male": "M", "female": "F", "m": "M", "f": "F"}
-            code = sex_map.get(document.document_metadata.sex.lower(), "U")
+        if metadata.sex:
+            code = self.GENDER_CODES.get(metadata.sex.lower(), "U")
             gender_code.set("code", code)
         else:
             gender_code.set("code", "U")
@@ -161,7 +229,7 @@ class XMLRenderer:
         Returns:
             Dict with 'given' and 'family' keys
         """
-        parts = full_name.strip().split()
+        parts = full_name.split()
         if len(parts) == 1:
             return {"given": "", "family": parts[0]}
         elif len(parts) >= 2:
@@ -196,10 +264,11 @@ class XMLRenderer:
 
         # Section text
         text_elem = SubElement(visit_section, "text")
-        text_content = f"Visit ID: {visit.get('visit_id', 'N/A')}\n"
-        text_content += f"Visit Date: {visit_date}\n"
-        text_content += f"Encounter Type: {visit.get('encounter_type', 'N/A')}\n"
-        text_elem.text = text_content
+        text_elem.text = (
+            f"Visit ID: {visit.get('visit_id', 'N/A')}\n"
+            f"Visit Date: {visit_date}\n"
+            f"Encounter Type: {visit.get('encounter_type', 'N/A')}\n"
+        )
 
         # Add clinical subsections
         self._add_reason_for_visit(visit_section, visit)
@@ -307,28 +376,27 @@ class XMLRenderer:
 
         # Table body
         tbody = SubElement(table, "tbody")
-        for med in medications:
-            tr = SubElement(tbody, "tr")
-
-            td_name = SubElement(tr, "td")
-            td_name.text = med.get("name", "")
-
-            td_dose = SubElement(tr, "td")
-            td_dose.text = med.get("dose", "") or "N/A"
-
-            td_freq = SubElement(tr, "td")
-            td_freq.text = med.get("frequency", "") or "N/A"
-
-            td_route = SubElement(tr, "td")
-            td_route.text = med.get("route", "") or "N/A"
-
-            td_page = SubElement(tr, "td")
-            td_page.text = str(med.get("source_page", "")) or "N/A"
+        self._add_table_rows(tbody, (
+            (
+                med.get("name") or "",
+                med.get("dose") or "N/A",
+                med.get("frequency") or "N/A",
+                med.get("route") or "N/A",
+                self._page_cell(med),
+            )
+            for med in medications
+        ))
 
     def _add_vital_signs(self, parent: Element, visit: Dict[str, Any]):
         """Add vital signs section"""
         vitals = visit.get("vital_signs", {})
-        if not vitals or not any(v.get("value") for v in vitals.values() if isinstance(v, dict)):
+        # Only vitals with a recorded value are listed
+        recorded = [
+            f"{vital_name}: {vital_data['value']} {vital_data.get('unit', '')}".strip()
+            for vital_name, vital_data in (vitals or {}).items()
+            if isinstance(vital_data, dict) and vital_data.get("value")
+        ]
+        if not recorded:
             return
 
         component = SubElement(parent, "component")
@@ -345,12 +413,9 @@ class XMLRenderer:
         text = SubElement(section, "text")
         list_elem = SubElement(text, "list")
 
-        for vital_name, vital_data in vitals.items():
-            if isinstance(vital_data, dict) and vital_data.get("value"):
-                item = SubElement(list_elem, "item")
-                value = vital_data["value"]
-                unit = vital_data.get("unit", "")
-                item.text = f"{vital_name}: {value} {unit}".strip()
+        for item_text in recorded:
+            item = SubElement(list_elem, "item")
+            item.text = item_text
 
     def _add_results(self, parent: Element, visit: Dict[str, Any]):
         """Add lab results section"""
@@ -381,26 +446,17 @@ class XMLRenderer:
 
         # Table body
         tbody = SubElement(table, "tbody")
-        for result in results:
-            tr = SubElement(tbody, "tr")
-
-            td_test = SubElement(tr, "td")
-            td_test.text = result.get("test_name", "")
-
-            td_value = SubElement(tr, "td")
-            td_value.text = str(result.get("value", "")) or "N/A"
-
-            td_unit = SubElement(tr, "td")
-            td_unit.text = result.get("unit", "") or "N/A"
-
-            td_ref = SubElement(tr, "td")
-            td_ref.text = result.get("reference_range", "") or "N/A"
-
-            td_flag = SubElement(tr, "td")
-            td_flag.text = result.get("abnormal_flag", "") or "normal"
-
-            td_page = SubElement(tr, "td")
-            td_page.text = str(result.get("source_page", "")) or "N/A"
+        self._add_table_rows(tbody, (
+            (
+                result.get("test_name") or "",
+                str(result.get("value", "")) or "N/A",
+                result.get("unit") or "N/A",
+                result.get("reference_range") or "N/A",
+                result.get("abnormal_flag") or "normal",
+                self._page_cell(result),
+            )
+            for result in results
+        ))
 
     def _add_assessment(self, parent: Element, visit: Dict[str, Any]):
         """Add assessment section"""
@@ -450,18 +506,51 @@ class XMLRenderer:
                 action_text += f" [Page {plan_item['source_page']}]"
             item.text = action_text
 
+    @staticmethod
+    def _page_cell(entry: Dict[str, Any]) -> str:
+        """Source page table cell; page 0 is a real page, only missing is N/A"""
+        page = entry.get("source_page")
+        return "N/A" if page is None or page == "" else str(page)
+
+    def _add_table_rows(self, tbody: Element, rows: Iterable[tuple]):
+        """Append a <tr> of text cells to tbody for each row of strings
+
+        Row markup is uniform, so it is formatted as one string and parsed
+        once rather than created with a SubElement call per cell.
+        """
+        cells = ["</td><td>".join(map(escape, row)) for row in rows]
+        if cells:
+            markup = "</td></tr><tr><td>".join(cells)
+            # The only place nodes move between documents: one extend() of
+            # namespace-free rows, relinked in linear time. Everything else is
+            # created in place with SubElement; keep it that way.
+            tbody.extend(fromstring(f"<tbody><tr><td>{markup}</td></tr></tbody>"))
+
+    def _new_root(self) -> Element:
+        """Create the ClinicalDocument root in the HL7 default namespace"""
+        if USING_LXML:
+            return Element("ClinicalDocument", nsmap={None: self.HL7_NAMESPACE})
+        root = Element("ClinicalDocument")
+        root.set("xmlns", self.HL7_NAMESPACE)
+        return root
+
     def _prettify_xml(self, elem: Element) -> str:
         """Convert XML element to pretty-printed string
 
+        Serialized in a single pass (lxml, or ElementTree.indent without it);
+        no reparse into a second DOM.
+
         Args:
             elem: XML Element
 
         Returns:
             Pretty-printed XML string with proper indentation
         """
-        rough_string = tostring(elem, encoding='utf-8')
-        reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ", encoding="UTF-8").decode('utf-8')
+        if USING_LXML:
+            return XML_DECLARATION + tostring(elem, pretty_print=True, encoding="unicode")
+
+        indent(elem, space="  ")
+        return XML_DECLARATION + tostring(elem, encoding="unicode") + "\n"
 
 
 class RenderError(Exception):
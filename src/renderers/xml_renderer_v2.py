@@ -9,15 +9,29 @@ NO data extraction logic allowed here.
 
 from datetime import datetime
 from typing import Dict, Any, List, Optional
-from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
+import copy
+import sys
 import uuid
 
+from lxml import etree
+from lxml.etree import Element, SubElement, tostring
+
 from ..models.canonical_schema import MedicalDocument
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+def _format_timestamp(dt: datetime) -> str:
+    """Format a datetime as YYYYMMDDHHMMSS
+
+    Fixed-width f-string is much cheaper than strftime's format parser.
+    """
+    return (
+        f"{dt.year:04d}{dt.month:02d}{dt.day:02d}"
+        f"{dt.hour:02d}{dt.minute:02d}{dt.second:02d}"
+    )
+
 
 class XMLRenderer:
     """Render canonical JSON to Practice Fusion-compatible CCD/C-CDA XML"""
@@ -26,6 +40,8 @@ class XMLRenderer:
     HL7_NAMESPACE = "urn:hl7-org:v3"
     XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
     SDTC_NAMESPACE = "urn:hl7-org:sdtc"
+    XSI_TYPE = f"{{{XSI_NAMESPACE}}}type"
+    NSMAP = {None: HL7_NAMESPACE, "xsi": XSI_NAMESPACE, "sdtc": SDTC_NAMESPACE}
 
     # Code systems
     LOINC_SYSTEM = "2.16.840.1.113883.6.1"
@@ -42,6 +58,41 @@ class XMLRenderer:
     RESULTS_ORGANIZER_TEMPLATE = "2.16.840.1.113883.10.20.22.4.1"
     RESULT_OBSERVATION_TEMPLATE = "2.16.840.1.113883.10.20.22.4.2"
 
+    # Fixed entry subtrees, deep-copied per problem/result and patched in place
+    _PROBLEM_ENTRY_SKELETON = etree.fromstring(
+        f'<entry xmlns:xsi="{XSI_NAMESPACE}" typeCode="DRIV">'
+        '<act classCode="ACT" moodCode="EVN">'
+        f'<templateId root="{PROBLEM_CONCERN_ACT_TEMPLATE}"/>'
+        '<id root="2.16.840.1.113883.19"/>'
+        '<code code="CONC" codeSystem="2.16.840.1.113883.5.6"/>'
+        '<statusCode code="active"/>'
+        '<effectiveTime><low nullFlavor="UNK"/></effectiveTime>'
+        '<entryRelationship typeCode="SUBJ">'
+        '<observation classCode="OBS" moodCode="EVN">'
+        f'<templateId root="{PROBLEM_OBSERVATION_TEMPLATE}"/>'
+        '<id root="2.16.840.1.113883.19"/>'
+        f'<code code="55607006" codeSystem="{SNOMED_SYSTEM}" displayName="Problem"/>'
+        '<statusCode code="completed"/>'
+        '<effectiveTime><low nullFlavor="UNK"/></effectiveTime>'
+        '<value xsi:type="CD"/>'
+        '</observation>'
+        '</entryRelationship>'
+        '</act>'
+        '</entry>'
+    )
+    _RESULT_COMPONENT_SKELETON = etree.fromstring(
+        f'<component xmlns:xsi="{XSI_NAMESPACE}">'
+        '<observation classCode="OBS" moodCode="EVN">'
+        f'<templateId root="{RESULT_OBSERVATION_TEMPLATE}"/>'
+        '<id root="2.16.840.1.113883.19"/>'
+        '<code/>'
+        '<statusCode code="completed"/>'
+        '<effectiveTime nullFlavor="UNK"/>'
+        '<value xsi:type="PQ"/>'
+        '</observation>'
+        '</component>'
+    )
+
     # Common SNOMED codes for problems
     SNOMED_CODES = {
         "polyuria": "284121005",
@@ -58,9 +109,32 @@ class XMLRenderer:
         "urine specific gravity": "2965-2",  # Specific gravity of Urine
     }
 
-    def __init__(self):
+    def __init__(self, log_every: int = 0):
+        """
+        Args:
+            log_every: Emit an INFO summary every N renders (0 = per-render
+                events at DEBUG only, for bulk jobs)
+        """
+        self._log_every = log_every
+        self._render_count = 0
+
+        # Code lookups are built once per instance; reuse a renderer across
+        # documents rather than constructing one per document
+        self._snomed_lookup = tuple(
+            (sys.intern(key), (code, key.title())) for key, code in self.SNOMED_CODES.items()
+        )
+        self._loinc_lookup = tuple(
+            (sys.intern(key), (code, key.title())) for key, code in self.LOINC_CODES.items()
+        )
         logger.info("XML renderer initialized (Practice Fusion CDA R2.1)")
 
+    def _log_rendered(self, event: str, **fields):
+        """Log a completed render at DEBUG, plus a sampled INFO every log_every renders"""
+        self._render_count += 1
+        logger.debug(event, **fields)
+        if self._log_every and self._render_count % self._log_every == 0:
+            logger.info("XML renders completed", renders=self._render_count, **fields)
+
     def render(self, document: MedicalDocument) -> str:
         """Render MedicalDocument to Practice Fusion CCD/C-CDA XML string
 
@@ -70,23 +144,37 @@ class XMLRenderer:
         Returns:
             XML string (formatted with indentation)
         """
-        logger.info("Rendering document to Practice Fusion XML", visits=len(document.visits))
+        return self.render_bytes(document).decode("utf-8")
+
+    def render_bytes(self, document: MedicalDocument) -> bytes:
+        """Render MedicalDocument to UTF-8 encoded Practice Fusion CCD/C-CDA XML
+
+        Prefer this over render() when the XML goes straight to a file or HTTP
+        response: it skips decoding the serialized document into a str copy.
+
+        Args:
+            document: Validated MedicalDocument instance
+
+        Returns:
+            UTF-8 XML bytes (formatted with indentation)
+        """
+        logger.debug("Rendering document to Practice Fusion XML", visits=len(document.visits))
 
         try:
+            # Format the processing timestamp once; header and author share it
+            processed_str = _format_timestamp(document.processed_at)
+
             # Create root element with namespaces
-            root = Element("ClinicalDocument")
-            root.set("xmlns", self.HL7_NAMESPACE)
-            root.set(f"xmlns:xsi", self.XSI_NAMESPACE)
-            root.set(f"xmlns:sdtc", self.SDTC_NAMESPACE)
+            root = Element("ClinicalDocument", nsmap=self.NSMAP)
 
             # Add document header
-            self._add_document_header(root, document)
+            self._add_document_header(root, document, processed_str)
 
             # Add patient
             self._add_patient(root, document)
 
             # Add author
-            self._add_author(root, document)
+            self._add_author(root, document, processed_str)
 
             # Add custodian
             self._add_custodian(root, document)
@@ -97,84 +185,94 @@ class XMLRenderer:
             # Add structured body
             self._add_structured_body(root, document)
 
-            # Convert to pretty XML string
-            xml_string = self._prettify_xml(root)
+            # Convert to pretty XML bytes
+            xml_bytes = self._prettify_xml(root)
 
-            logger.info("XML rendering complete", size_bytes=len(xml_string))
-            return xml_string
+            self._log_rendered("XML rendering complete", size_bytes=len(xml_bytes))
+            return xml_bytes
 
         except Exception as e:
             logger.error("XML rendering failed", error=str(e))
             raise RenderError(f"Failed to render XML: {e}")
 
-    def _add_document_header(self, root: Element, document: MedicalDocument):
+    def _visit_sections(self) -> tuple:
+        """Clinical section builders in document order"""
+        return (
+            self._add_reason_for_visit_section,
+            self._add_hpi_section,
+            self._add_problem_section,
+            self._add_results_section,
+            self._add_assessment_section,
+            self._add_plan_section,
+        )
+
+    def _add_document_header(self, root: Element, document: MedicalDocument, processed_str: str):
         """Add document header with template IDs and metadata"""
         # Type ID
-        type_id = SubElement(root, "typeId")
-        type_id.set("root", "2.16.840.1.113883.1.3")
-        type_id.set("extension", "POCD_HD000040")
+        SubElement(root, "typeId", root="2.16.840.1.113883.1.3", extension="POCD_HD000040")
 
         # Template ID - CCD
-        template_id = SubElement(root, "templateId")
-        template_id.set("root", self.CCD_TEMPLATE)
+        SubElement(root, "templateId", root=self.CCD_TEMPLATE)
 
         # Document ID
-        doc_id = SubElement(root, "id")
-        doc_id.set("root", "2.16.840.1.113883.19")
-        doc_id.set("extension", f"doc_{uuid.uuid4().hex[:16]}")
+        SubElement(
+            root,
+            "id",
+            root="2.16.840.1.113883.19",
+            extension=f"doc_{uuid.uuid4().hex[:16]}",
+        )
 
         # Code - Summarization of Episode Note
-        code = SubElement(root, "code")
-        code.set("code", "34133-9")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "Summarization of Episode Note")
+        SubElement(
+            root,
+            "code",
+            code="34133-9",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Summarization of Episode Note",
+        )
 
         # Title
         title = SubElement(root, "title")
         title.text = "Continuity of Care Document (CCD) - Specialist Consult Summary"
 
         # Effective time
-        effective_time = SubElement(root, "effectiveTime")
-        effective_time.set("value", document.processed_at.strftime("%Y%m%d%H%M%S"))
+        SubElement(root, "effectiveTime", value=processed_str)
 
         # Confidentiality code
-        confidentiality = SubElement(root, "confidentialityCode")
-        confidentiality.set("code", "N")
-        confidentiality.set("codeSystem", "2.16.840.1.113883.5.25")
+        SubElement(root, "confidentialityCode", code="N", codeSystem="2.16.840.1.113883.5.25")
 
         # Language code
-        language = SubElement(root, "languageCode")
-        language.set("code", "en-US")
+        SubElement(root, "languageCode", code="en-US")
 
     def _add_patient(self, root: Element, document: MedicalDocument):
         """Add patient demographics section"""
+        md = document.document_metadata
         record_target = SubElement(root, "recordTarget")
         patient_role = SubElement(record_target, "patientRole")
 
         # Patient ID
         patient_id = SubElement(patient_role, "id")
-        if document.document_metadata.patient_id:
-            patient_id.set("root", "2.16.840.1.113883.3.1")
-            patient_id.set("extension", str(document.document_metadata.patient_id))
+        if md.patient_id:
+            patient_id.attrib.update({
+                "root": "2.16.840.1.113883.3.1",
+                "extension": str(md.patient_id),
+            })
         else:
             patient_id.set("nullFlavor", "UNK")
 
         # Address (placeholder - OCR doesn't typically extract this)
-        addr = SubElement(patient_role, "addr")
-        addr.set("use", "HP")
-        addr.set("nullFlavor", "UNK")
+        SubElement(patient_role, "addr", use="HP", nullFlavor="UNK")
 
         # Telecom (placeholder)
-        telecom = SubElement(patient_role, "telecom")
-        telecom.set("nullFlavor", "UNK")
+        SubElement(patient_role, "telecom", nullFlavor="UNK")
 
         # Patient details
         patient = SubElement(patient_role, "patient")
 
         # Name
         name = SubElement(patient, "name")
-        if document.document_metadata.patient_name:
-            name_parts = self._parse_name(document.document_metadata.patient_name)
+        if md.patient_name:
+            name_parts = self._parse_name(md.patient_name)
             if name_parts.get("given"):
                 given = SubElement(name, "given")
                 given.text = name_parts["given"]
@@ -185,46 +283,46 @@ class XMLRenderer:
             name.set("nullFlavor", "UNK")
 
         # Gender
-        gender_code = SubElement(patient, "administrativeGenderCode")
-        if document.document_metadata.sex:
+        if md.sex:
             sex_map = {"male": "M", "female": "F", "m": "M", "f": "F"}
-            code = sex_map.get(str(document.document_metadata.sex).lower(), "U")
-            gender_code.set("code", code)
+            code = sex_map.get(str(md.sex).lower(), "U")
         else:
-            gender_code.set("code", "U")
-        gender_code.set("codeSystem", self.GENDER_CODE_SYSTEM)
+            code = "U"
+        SubElement(
+            patient, "administrativeGenderCode", code=code, codeSystem=self.GENDER_CODE_SYSTEM
+        )
 
         # Birth time
         birth_time = SubElement(patient, "birthTime")
-        if document.document_metadata.dob:
-            dob_str = document.document_metadata.dob.strftime("%Y%m%d") if hasattr(document.document_metadata.dob, 'strftime') else str(document.document_metadata.dob).replace("-", "")
+        if md.dob:
+            dob = md.dob
+            if hasattr(dob, 'year'):
+                dob_str = f"{dob.year:04d}{dob.month:02d}{dob.day:02d}"
+            else:
+                dob_str = str(dob).replace("-", "")
             birth_time.set("value", dob_str)
         else:
             birth_time.set("nullFlavor", "UNK")
 
-    def _add_author(self, root: Element, document: MedicalDocument):
+    def _add_author(self, root: Element, document: MedicalDocument, processed_str: str):
         """Add author section (OCR processor)"""
+        md = document.document_metadata
         author = SubElement(root, "author")
 
         # Time
-        time = SubElement(author, "time")
-        time.set("value", document.processed_at.strftime("%Y%m%d%H%M%S"))
+        SubElement(author, "time", value=processed_str)
 
         # Assigned author
         assigned_author = SubElement(author, "assignedAuthor")
 
         # ID
-        author_id = SubElement(assigned_author, "id")
-        author_id.set("root", "2.16.840.1.113883.19.5")
-        author_id.set("extension", "OCR_SYSTEM")
+        SubElement(assigned_author, "id", root="2.16.840.1.113883.19.5", extension="OCR_SYSTEM")
 
         # Address (nullFlavor for automated system)
-        addr = SubElement(assigned_author, "addr")
-        addr.set("nullFlavor", "UNK")
+        SubElement(assigned_author, "addr", nullFlavor="UNK")
 
         # Telecom
-        telecom = SubElement(assigned_author, "telecom")
-        telecom.set("nullFlavor", "UNK")
+        SubElement(assigned_author, "telecom", nullFlavor="UNK")
 
         # Assigned person
         assigned_person = SubElement(assigned_author, "assignedPerson")
@@ -232,12 +330,11 @@ class XMLRenderer:
         name.text = "Medical PDF OCR System"
 
         # Represented organization
-        if document.document_metadata.organization:
+        if md.organization:
             rep_org = SubElement(assigned_author, "representedOrganization")
-            org_id = SubElement(rep_org, "id")
-            org_id.set("nullFlavor", "UNK")
+            SubElement(rep_org, "id", nullFlavor="UNK")
             org_name = SubElement(rep_org, "name")
-            org_name.text = document.document_metadata.organization
+            org_name.text = md.organization
 
     def _add_custodian(self, root: Element, document: MedicalDocument):
         """Add custodian section"""
@@ -246,9 +343,7 @@ class XMLRenderer:
         rep_custodian_org = SubElement(assigned_custodian, "representedCustodianOrganization")
 
         # ID
-        custodian_id = SubElement(rep_custodian_org, "id")
-        custodian_id.set("root", "2.16.840.1.113883.19.5")
-        custodian_id.set("extension", "CUSTODIAN")
+        SubElement(rep_custodian_org, "id", root="2.16.840.1.113883.19.5", extension="CUSTODIAN")
 
         # Name
         custodian_name = SubElement(rep_custodian_org, "name")
@@ -259,19 +354,23 @@ class XMLRenderer:
         component_of = SubElement(root, "componentOf")
         encompassing_encounter = SubElement(component_of, "encompassingEncounter")
 
+        first_visit = document.visits[0] if document.visits else None
+
         # Encounter ID
         encounter_id = SubElement(encompassing_encounter, "id")
         # Use first visit's ID if available
-        if document.visits:
-            encounter_id.set("root", "2.16.840.1.113883.19")
-            encounter_id.set("extension", document.visits[0].get("visit_id", "encounter_001"))
+        if first_visit:
+            encounter_id.attrib.update({
+                "root": "2.16.840.1.113883.19",
+                "extension": first_visit.get("visit_id", "encounter_001"),
+            })
         else:
             encounter_id.set("nullFlavor", "UNK")
 
         # Effective time
         effective_time = SubElement(encompassing_encounter, "effectiveTime")
-        if document.visits and document.visits[0].get("visit_date"):
-            visit_date = document.visits[0]["visit_date"]
+        if first_visit and first_visit.get("visit_date"):
+            visit_date = first_visit["visit_date"]
             if isinstance(visit_date, str):
                 # Try to parse date string
                 date_value = visit_date.replace("-", "")
@@ -290,23 +389,9 @@ class XMLRenderer:
         if document.visits:
             visit = document.visits[0]
 
-            # Reason for visit
-            self._add_reason_for_visit_section(structured_body, visit)
-
-            # History of present illness
-            self._add_hpi_section(structured_body, visit)
-
-            # Problem list
-            self._add_problem_section(structured_body, visit)
-
-            # Results
-            self._add_results_section(structured_body, visit)
-
-            # Assessment
-            self._add_assessment_section(structured_body, visit)
-
-            # Plan
-            self._add_plan_section(structured_body, visit)
+            # Reason, HPI, problems, results, assessment, plan
+            for add_section in self._visit_sections():
+                add_section(structured_body, visit)
 
     def _add_reason_for_visit_section(self, structured_body: Element, visit: Dict[str, Any]):
         """Add reason for visit section"""
@@ -317,14 +402,16 @@ class XMLRenderer:
         section = SubElement(component, "section")
 
         # Template ID
-        template_id = SubElement(section, "templateId")
-        template_id.set("root", self.REASON_VISIT_TEMPLATE)
+        SubElement(section, "templateId", root=self.REASON_VISIT_TEMPLATE)
 
         # Code
-        code = SubElement(section, "code")
-        code.set("code", "29299-5")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "Reason for visit")
+        SubElement(
+            section,
+            "code",
+            code="29299-5",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Reason for visit",
+        )
 
         # Title
         title = SubElement(section, "title")
@@ -344,10 +431,13 @@ class XMLRenderer:
         section = SubElement(component, "section")
 
         # Code
-        code = SubElement(section, "code")
-        code.set("code", "10164-2")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "History of Present Illness")
+        SubElement(
+            section,
+            "code",
+            code="10164-2",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="History of Present Illness",
+        )
 
         # Title
         title = SubElement(section, "title")
@@ -368,14 +458,16 @@ class XMLRenderer:
         section = SubElement(component, "section")
 
         # Template ID
-        template_id = SubElement(section, "templateId")
-        template_id.set("root", self.PROBLEM_SECTION_TEMPLATE)
+        SubElement(section, "templateId", root=self.PROBLEM_SECTION_TEMPLATE)
 
         # Code
-        code = SubElement(section, "code")
-        code.set("code", "11450-4")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "Problem List")
+        SubElement(
+            section,
+            "code",
+            code="11450-4",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Problem List",
+        )
 
         # Title
         title = SubElement(section, "title")
@@ -384,94 +476,39 @@ class XMLRenderer:
         # Text (narrative)
         text = SubElement(section, "text")
         list_elem = SubElement(text, "list")
-        for problem in problems:
+        problem_texts = [problem.get("problem", "") for problem in problems]
+        for problem_text in problem_texts:
             item = SubElement(list_elem, "item")
-            item.text = problem.get("problem", "")
+            item.text = problem_text
 
-        # Entries (structured)
-        for i, problem in enumerate(problems):
-            self._add_problem_entry(section, problem, i)
+        # Entries (structured) - lowercase each problem once for the SNOMED lookup
+        for i, problem_text in enumerate(problem_texts):
+            self._add_problem_entry(section, problem_text, problem_text.lower(), i)
 
-    def _add_problem_entry(self, section: Element, problem: Dict[str, Any], index: int):
+    def _add_problem_entry(
+        self, section: Element, problem_text: str, problem_lower: str, index: int
+    ):
         """Add a structured problem entry with Problem Concern Act template"""
-        entry = SubElement(section, "entry")
-        entry.set("typeCode", "DRIV")
-
-        # Problem Concern Act
-        act = SubElement(entry, "act")
-        act.set("classCode", "ACT")
-        act.set("moodCode", "EVN")
-
-        # Template ID
-        template_id = SubElement(act, "templateId")
-        template_id.set("root", self.PROBLEM_CONCERN_ACT_TEMPLATE)
-
-        # ID
-        act_id = SubElement(act, "id")
-        act_id.set("root", "2.16.840.1.113883.19")
-        act_id.set("extension", f"problem_act_{index}")
-
-        # Code
-        code = SubElement(act, "code")
-        code.set("code", "CONC")
-        code.set("codeSystem", "2.16.840.1.113883.5.6")
-
-        # Status code
-        status_code = SubElement(act, "statusCode")
-        status_code.set("code", "active")
-
-        # Effective time
-        effective_time = SubElement(act, "effectiveTime")
-        low = SubElement(effective_time, "low")
-        low.set("nullFlavor", "UNK")
-
-        # Entry relationship - Problem Observation
-        entry_relationship = SubElement(act, "entryRelationship")
-        entry_relationship.set("typeCode", "SUBJ")
-
-        observation = SubElement(entry_relationship, "observation")
-        observation.set("classCode", "OBS")
-        observation.set("moodCode", "EVN")
-
-        # Template ID
-        obs_template = SubElement(observation, "templateId")
-        obs_template.set("root", self.PROBLEM_OBSERVATION_TEMPLATE)
-
-        # ID
-        obs_id = SubElement(observation, "id")
-        obs_id.set("root", "2.16.840.1.113883.19")
-        obs_id.set("extension", f"problem_obs_{index}")
-
-        # Code
-        obs_code = SubElement(observation, "code")
-        obs_code.set("code", "55607006")
-        obs_code.set("codeSystem", self.SNOMED_SYSTEM)
-        obs_code.set("displayName", "Problem")
-
-        # Status code
-        obs_status = SubElement(observation, "statusCode")
-        obs_status.set("code", "completed")
-
-        # Effective time
-        obs_time = SubElement(observation, "effectiveTime")
-        obs_low = SubElement(obs_time, "low")
-        obs_low.set("nullFlavor", "UNK")
-
-        # Value (SNOMED code if available)
-        value = SubElement(observation, "value")
-        value.set(f"{{{self.XSI_NAMESPACE}}}type", "CD")
+        # Clone the fixed Problem Concern Act / Problem Observation subtree and
+        # patch the per-problem attributes
+        entry = copy.deepcopy(self._PROBLEM_ENTRY_SKELETON)
+        entry.find("act/id").set("extension", f"problem_act_{index}")
+        observation = entry.find("act/entryRelationship/observation")
+        observation.find("id").set("extension", f"problem_obs_{index}")
+        value = observation.find("value")
+        section.append(entry)
 
         # Try to find SNOMED code
-        problem_text = problem.get("problem", "").lower()
-        snomed_code = self._find_snomed_code(problem_text)
+        snomed_code = self._find_snomed_code(problem_lower)
 
         if snomed_code:
-            value.set("code", snomed_code[0])
-            value.set("codeSystem", self.SNOMED_SYSTEM)
-            value.set("displayName", snomed_code[1])
+            value.attrib.update({
+                "code": snomed_code[0],
+                "codeSystem": self.SNOMED_SYSTEM,
+                "displayName": snomed_code[1],
+            })
         else:
-            value.set("nullFlavor", "OTH")
-            value.set("displayName", problem.get("problem", ""))
+            value.attrib.update({"nullFlavor": "OTH", "displayName": problem_text})
 
     def _add_results_section(self, structured_body: Element, visit: Dict[str, Any]):
         """Add results section with organizer"""
@@ -483,14 +520,16 @@ class XMLRenderer:
         section = SubElement(component, "section")
 
         # Template ID
-        template_id = SubElement(section, "templateId")
-        template_id.set("root", self.RESULTS_SECTION_TEMPLATE)
+        SubElement(section, "templateId", root=self.RESULTS_SECTION_TEMPLATE)
 
         # Code
-        code = SubElement(section, "code")
-        code.set("code", "30954-2")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "Relevant diagnostic tests and/or laboratory data")
+        SubElement(
+            section,
+            "code",
+            code="30954-2",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Relevant diagnostic tests and/or laboratory data",
+        )
 
         # Title
         title = SubElement(section, "title")
@@ -498,9 +537,7 @@ class XMLRenderer:
 
         # Text (narrative table)
         text = SubElement(section, "text")
-        table = SubElement(text, "table")
-        table.set("border", "1")
-        table.set("width", "100%")
+        table = SubElement(text, "table", border="1", width="100%")
 
         # Table header
         thead = SubElement(table, "thead")
@@ -511,96 +548,87 @@ class XMLRenderer:
 
         # Table body
         tbody = SubElement(table, "tbody")
+        test_names = []
         for result in results:
+            r_get = result.get
+            test_name = r_get("test_name", "")
+            test_names.append(test_name)
             tr = SubElement(tbody, "tr")
 
             td_test = SubElement(tr, "td")
-            td_test.text = result.get("test_name", "")
+            td_test.text = test_name
 
             td_value = SubElement(tr, "td")
-            td_value.text = str(result.get("value", ""))
+            td_value.text = str(r_get("value", ""))
 
             td_unit = SubElement(tr, "td")
-            td_unit.text = result.get("unit", "")
+            td_unit.text = r_get("unit", "")
 
             td_notes = SubElement(tr, "td")
-            if result.get("abnormal_flag") and result["abnormal_flag"] != "normal":
-                td_notes.text = f"Abnormal: {result['abnormal_flag']}"
+            abnormal_flag = r_get("abnormal_flag")
+            if abnormal_flag and abnormal_flag != "normal":
+                td_notes.text = f"Abnormal: {abnormal_flag}"
 
         # Structured entry - Organizer
-        entry = SubElement(section, "entry")
-        entry.set("typeCode", "DRIV")
+        entry = SubElement(section, "entry", typeCode="DRIV")
 
-        organizer = SubElement(entry, "organizer")
-        organizer.set("classCode", "CLUSTER")
-        organizer.set("moodCode", "EVN")
+        organizer = SubElement(entry, "organizer", classCode="CLUSTER", moodCode="EVN")
 
         # Template ID
-        org_template = SubElement(organizer, "templateId")
-        org_template.set("root", self.RESULTS_ORGANIZER_TEMPLATE)
+        SubElement(organizer, "templateId", root=self.RESULTS_ORGANIZER_TEMPLATE)
 
         # ID
-        org_id = SubElement(organizer, "id")
-        org_id.set("root", "2.16.840.1.113883.19")
-        org_id.set("extension", f"results_org_{uuid.uuid4().hex[:8]}")
+        SubElement(
+            organizer,
+            "id",
+            root="2.16.840.1.113883.19",
+            extension=f"results_org_{uuid.uuid4().hex[:8]}",
+        )
 
         # Code
-        org_code = SubElement(organizer, "code")
-        org_code.set("code", "18719-5")
-        org_code.set("codeSystem", self.LOINC_SYSTEM)
-        org_code.set("displayName", "Chemistry studies")
+        SubElement(
+            organizer,
+            "code",
+            code="18719-5",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Chemistry studies",
+        )
 
         # Status code
-        org_status = SubElement(organizer, "statusCode")
-        org_status.set("code", "completed")
+        SubElement(organizer, "statusCode", code="completed")
 
         # Components (observations)
-        for i, result in enumerate(results):
-            self._add_result_observation(organizer, result, i)
+        for i, (result, test_name) in enumerate(zip(results, test_names)):
+            self._add_result_observation(organizer, result, test_name, i)
 
-    def _add_result_observation(self, organizer: Element, result: Dict[str, Any], index: int):
+    def _add_result_observation(
+        self, organizer: Element, result: Dict[str, Any], test_name: str, index: int
+    ):
         """Add a result observation component"""
-        component = SubElement(organizer, "component")
-
-        observation = SubElement(component, "observation")
-        observation.set("classCode", "OBS")
-        observation.set("moodCode", "EVN")
-
-        # Template ID
-        template_id = SubElement(observation, "templateId")
-        template_id.set("root", self.RESULT_OBSERVATION_TEMPLATE)
-
-        # ID
-        obs_id = SubElement(observation, "id")
-        obs_id.set("root", "2.16.840.1.113883.19")
-        obs_id.set("extension", f"result_obs_{index}")
+        # Clone the fixed Result Observation subtree and patch id/code/value
+        component = copy.deepcopy(self._RESULT_COMPONENT_SKELETON)
+        observation = component[0]
+        observation.find("id").set("extension", f"result_obs_{index}")
 
         # Code (LOINC if available)
-        code = SubElement(observation, "code")
-        test_name = result.get("test_name", "").lower()
-        loinc_code = self._find_loinc_code(test_name)
+        code = observation.find("code")
+        loinc_code = self._find_loinc_code(test_name.lower())
 
         if loinc_code:
-            code.set("code", loinc_code[0])
-            code.set("codeSystem", self.LOINC_SYSTEM)
-            code.set("displayName", loinc_code[1])
+            code.attrib.update({
+                "code": loinc_code[0],
+                "codeSystem": self.LOINC_SYSTEM,
+                "displayName": loinc_code[1],
+            })
         else:
-            code.set("nullFlavor", "OTH")
-            code.set("displayName", result.get("test_name", ""))
-
-        # Status code
-        status_code = SubElement(observation, "statusCode")
-        status_code.set("code", "completed")
-
-        # Effective time
-        effective_time = SubElement(observation, "effectiveTime")
-        effective_time.set("nullFlavor", "UNK")
+            code.attrib.update({"nullFlavor": "OTH", "displayName": test_name})
 
         # Value
-        value = SubElement(observation, "value")
-        value.set(f"{{{self.XSI_NAMESPACE}}}type", "PQ")
-        value.set("value", str(result.get("value", "")))
-        value.set("unit", result.get("unit", "1"))
+        observation.find("value").attrib.update({
+            "value": str(result.get("value", "")),
+            "unit": result.get("unit", "1"),
+        })
+        organizer.append(component)
 
     def _add_assessment_section(self, structured_body: Element, visit: Dict[str, Any]):
         """Add assessment section"""
@@ -611,10 +639,13 @@ class XMLRenderer:
         section = SubElement(component, "section")
 
         # Code
-        code = SubElement(section, "code")
-        code.set("code", "51848-0")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "Assessment")
+        SubElement(
+            section,
+            "code",
+            code="51848-0",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Assessment",
+        )
 
         # Title
         title = SubElement(section, "title")
@@ -635,10 +666,13 @@ class XMLRenderer:
         section = SubElement(component, "section")
 
         # Code
-        code = SubElement(section, "code")
-        code.set("code", "18776-5")
-        code.set("codeSystem", self.LOINC_SYSTEM)
-        code.set("displayName", "Plan of care note")
+        SubElement(
+            section,
+            "code",
+            code="18776-5",
+            codeSystem=self.LOINC_SYSTEM,
+            displayName="Plan of care note",
+        )
 
         # Title
         title = SubElement(section, "title")
@@ -653,7 +687,7 @@ class XMLRenderer:
 
     def _parse_name(self, full_name: str) -> Dict[str, str]:
         """Parse full name into given and family names"""
-        parts = full_name.strip().split()
+        parts = full_name.split()
         if len(parts) == 1:
             return {"given": "", "family": parts[0]}
         elif len(parts) >= 2:
@@ -663,23 +697,23 @@ class XMLRenderer:
 
     def _find_snomed_code(self, problem_text: str) -> Optional[tuple]:
         """Find SNOMED code for a problem"""
-        for key, code in self.SNOMED_CODES.items():
+        for key, coded in self._snomed_lookup:
             if key in problem_text:
-                return (code, key.title())
+                return coded
         return None
 
     def _find_loinc_code(self, test_name: str) -> Optional[tuple]:
         """Find LOINC code for a lab test"""
-        for key, code in self.LOINC_CODES.items():
+        for key, coded in self._loinc_lookup:
             if key in test_name:
-                return (code, key.title())
+                return coded
         return None
 
-    def _prettify_xml(self, elem: Element) -> str:
-        """Convert XML element to pretty-printed string"""
+    def _prettify_xml(self, elem: Element) -> bytes:
+        """Convert XML element to pretty-printed UTF-8 bytes"""
         rough_string = tostring(elem, encoding='utf-8')
         reparsed = minidom.parseString(rough_string)
-        return reparsed.toprettyxml(indent="  ", encoding="UTF-8").decode('utf-8')
+        return reparsed.toprettyxml(indent="  ", encoding="UTF-8")
 
 
 class RenderError(Exception):
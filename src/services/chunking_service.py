@@ -5,6 +5,7 @@ Groups OCR pages into logical visits/encounters using rule-based + LLM-assisted
 
 import re
 from datetime import datetime
+from statistics import fmean
 from typing import Dict, List, Optional
 
 from ..utils.logger import get_logger
@@ -16,29 +17,43 @@ class ChunkingService:
     """Chunk OCR pages into visits/encounters"""
 
     def __init__(self):
+        # Patterns are compiled once; they run against every OCR page
         # Common medical section headers (case-insensitive patterns)
         self.visit_boundary_patterns = [
-            r"(?i)^visit date:",
-            r"(?i)^date of service:",
-            r"(?i)^encounter date:",
-            r"(?i)^admission date:",
-            r"(?i)^discharge date:",
-            r"(?i)^\d{1,2}/\d{1,2}/\d{2,4}",  # Date at start of line
+            re.compile(pattern, re.MULTILINE)
+            for pattern in (
+                r"(?i)^visit date:",
+                r"(?i)^date of service:",
+                r"(?i)^encounter date:",
+                r"(?i)^admission date:",
+                r"(?i)^discharge date:",
+                r"(?i)^\d{1,2}/\d{1,2}/\d{2,4}",  # Date at start of line
+            )
         ]
 
         self.section_headers = [
-            r"(?i)^chief complaint:",
-            r"(?i)^reason for visit:",
-            r"(?i)^history of present illness:",
-            r"(?i)^hpi:",
-            r"(?i)^past medical history:",
-            r"(?i)^pmh:",
-            r"(?i)^medications:",
-            r"(?i)^allergies:",
-            r"(?i)^physical exam:",
-            r"(?i)^assessment:",
-            r"(?i)^plan:",
-            r"(?i)^impression:",
+            re.compile(pattern, re.MULTILINE)
+            for pattern in (
+                r"(?i)^chief complaint:",
+                r"(?i)^reason for visit:",
+                r"(?i)^history of present illness:",
+                r"(?i)^hpi:",
+                r"(?i)^past medical history:",
+                r"(?i)^pmh:",
+                r"(?i)^medications:",
+                r"(?i)^allergies:",
+                r"(?i)^physical exam:",
+                r"(?i)^assessment:",
+                r"(?i)^plan:",
+                r"(?i)^impression:",
+            )
+        ]
+
+        # Common date patterns
+        self.date_patterns = [
+            re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})"),  # MM/DD/YYYY or DD-MM-YYYY
+            re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})"),  # YYYY-MM-DD
+            re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2})"),  # MM/DD/YY
         ]
 
     def detect_visit_boundaries(self, ocr_pages: List[Dict[str, any]]) -> List[Dict[str, any]]:
@@ -111,10 +126,7 @@ class ChunkingService:
         Returns:
             True if this appears to start a new visit
         """
-        for pattern in self.visit_boundary_patterns:
-            if re.search(pattern, text, re.MULTILINE):
-                return True
-        return False
+        return any(pattern.search(text) for pattern in self.visit_boundary_patterns)
 
     def _extract_date(self, text: str) -> Optional[str]:
         """Extract date from text (ISO 8601 format)
@@ -125,15 +137,8 @@ class ChunkingService:
         Returns:
             Date string in YYYY-MM-DD format or None
         """
-        # Common date patterns
-        date_patterns = [
-            r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})",  # MM/DD/YYYY or DD-MM-YYYY
-            r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})",  # YYYY-MM-DD
-            r"(\d{1,2})[/-](\d{1,2})[/-](\d{2})",  # MM/DD/YY
-        ]
-
-        for pattern in date_patterns:
-            match = re.search(pattern, text)
+        for pattern in self.date_patterns:
+            match = pattern.search(text)
             if match:
                 try:
                     # Try to parse and normalize
@@ -168,14 +173,15 @@ class ChunkingService:
         chunks = self.detect_visit_boundaries(ocr_results)
 
         # Add additional metadata
+        confidence_by_page = {ocr["page_number"]: ocr["confidence_score"] for ocr in ocr_results}
         for chunk in chunks:
             chunk["page_count"] = len(chunk["pages"])
-            chunk["confidence"] = self._calculate_chunk_confidence(chunk, ocr_results)
+            chunk["confidence"] = self._calculate_chunk_confidence(chunk, confidence_by_page)
 
         logger.info(
             "Chunking complete",
             total_visits=len(chunks),
-            avg_pages_per_visit=sum(c["page_count"] for c in chunks) / len(chunks) if chunks else 0,
+            avg_pages_per_visit=fmean(c["page_count"] for c in chunks) if chunks else 0,
         )
 
         return chunks
@@ -183,25 +189,25 @@ class ChunkingService:
     def _calculate_chunk_confidence(
         self,
         chunk: Dict[str, any],
-        ocr_results: List[Dict[str, any]]
+        confidence_by_page: Dict[int, float]
     ) -> float:
         """Calculate confidence score for a chunk
 
         Args:
             chunk: Visit chunk
-            ocr_results: Original OCR results
+            confidence_by_page: OCR confidence score keyed by page number
 
         Returns:
             Confidence score (0.0-1.0)
         """
         # Get OCR confidence for pages in this chunk
         page_confidences = [
-            ocr["confidence_score"]
-            for ocr in ocr_results
-            if ocr["page_number"] in chunk["pages"]
+            confidence_by_page[page]
+            for page in chunk["pages"]
+            if page in confidence_by_page
         ]
 
         if not page_confidences:
             return 0.0
 
-        return sum(page_confidences) / len(page_confidences)
+        return fmean(page_confidences)
@@ -6,12 +6,19 @@ medical data across visits and pages.
 Follows LLM_TECHNICAL_SPEC.md Section 8: Deduplication & Merge Rules
 """
 
-from typing import List, Dict, Any, Tuple
+from typing import Callable, List, Dict, Any, Tuple
+from bisect import bisect_left, bisect_right
 from difflib import SequenceMatcher
 import re
 
 from ..utils.logger import get_logger
 
+# Optional: C-implemented prefilter for fuzzy matching (pip install rapidfuzz)
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
 logger = get_logger(__name__)
 
 
@@ -70,9 +77,98 @@ class DeduplicationService:
         if not norm1 or not norm2:
             return 0.0
 
-        # Use SequenceMatcher for fuzzy string matching
         return SequenceMatcher(None, norm1, norm2).ratio()
 
+    def _pairwise_similarity(self, texts: List[str]) -> Callable[[int, int], float]:
+        """Build a similarity lookup for every pair of texts
+
+        Scores are always SequenceMatcher ratios, the metric the fuzzy
+        threshold is calibrated for. rapidfuzz's Indel ratio is a different
+        metric but never lower (every SequenceMatcher match is a common
+        subsequence), so when installed one cdist call over the whole list
+        rules out pairs that cannot reach the threshold before any
+        SequenceMatcher runs. Pairs below the fuzzy threshold score 0.0.
+
+        Args:
+            texts: Strings to compare
+
+        Returns:
+            Function mapping (i, j) to the similarity of texts[i] and texts[j]
+        """
+        normalized = [self.normalize_text(text) for text in texts]
+
+        if process is None or len(texts) < 2:
+            return lambda i, j: self._bounded_ratio(normalized[i], normalized[j])
+
+        # Slack keeps float rounding from dropping pairs right at the threshold
+        upper_bounds = process.cdist(
+            normalized,
+            normalized,
+            scorer=fuzz.ratio,
+            score_cutoff=max(self.fuzzy_threshold * 100 - 1e-6, 0.0),
+            workers=-1,
+        )
+
+        def similarity(i: int, j: int) -> float:
+            if not upper_bounds[i][j]:
+                return 0.0
+            return self._bounded_ratio(normalized[i], normalized[j])
+
+        return similarity
+
+    def _candidate_indices(self, texts: List[str]) -> List[List[int]]:
+        """Block entries by normalized length before pairwise comparison
+
+        Two strings can only reach a similarity ratio of t if the shorter is
+        at least t / (2 - t) of the longer, so each entry is compared only
+        with entries in that length band. Exact matches share a length and
+        always remain candidates.
+
+        Args:
+            texts: Strings to compare
+
+        Returns:
+            For each index i, the ascending indices j > i worth comparing
+        """
+        lengths = [len(self.normalize_text(text)) for text in texts]
+        if self.fuzzy_threshold <= 0:
+            return [list(range(i + 1, len(texts))) for i in range(len(texts))]
+
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        sorted_lengths = [lengths[k] for k in order]
+        band = self.fuzzy_threshold / (2 - self.fuzzy_threshold)
+
+        candidates = []
+        for i, length in enumerate(lengths):
+            lo = bisect_left(sorted_lengths, length * band - 1e-9)
+            hi = bisect_right(sorted_lengths, length / band + 1e-9)
+            candidates.append(sorted(k for k in order[lo:hi] if k > i))
+        return candidates
+
+    def _bounded_ratio(self, norm1: str, norm2: str) -> float:
+        """SequenceMatcher ratio of normalized texts, pruned at the threshold
+
+        Most candidate pairs are clearly dissimilar, so check the cheap upper
+        bounds (length only, then character multiset) first and skip the full
+        ratio when either already falls below the fuzzy threshold.
+
+        Args:
+            norm1: First normalized string
+            norm2: Second normalized string
+
+        Returns:
+            Similarity score, or 0.0 if it cannot reach the threshold
+        """
+        if not norm1 or not norm2:
+            return 0.0
+
+        matcher = SequenceMatcher(None, norm1, norm2)
+        if matcher.real_quick_ratio() < self.fuzzy_threshold:
+            return 0.0
+        if matcher.quick_ratio() < self.fuzzy_threshold:
+            return 0.0
+        return matcher.ratio()
+
     def is_exact_match(self, text1: str, text2: str) -> bool:
         """Check if two texts are exact matches (after normalization)
 
@@ -119,6 +215,9 @@ class DeduplicationService:
 
         merged = []
         processed_indices = set()
+        names = [med.get("name", "") for med in medications]
+        similarity_of = self._pairwise_similarity(names)
+        candidates = self._candidate_indices(names)
 
         for i, med1 in enumerate(medications):
             if i in processed_indices:
@@ -130,10 +229,12 @@ class DeduplicationService:
             matched_indices = {i}
 
             # Find duplicates
-            for j, med2 in enumerate(medications[i+1:], start=i+1):
+            for j in candidates[i]:
                 if j in processed_indices:
                     continue
 
+                med2 = medications[j]
+
                 name1 = med1.get("name", "")
                 name2 = med2.get("name", "")
 
@@ -158,8 +259,8 @@ class DeduplicationService:
 
                 # Fuzzy match
                 else:
-                    is_match, similarity = self.is_fuzzy_match(name1, name2)
-                    if is_match:
+                    similarity = similarity_of(i, j)
+                    if similarity >= self.fuzzy_threshold:
                         logger.debug(
                             "Fuzzy medication match",
                             name1=name1,
@@ -251,6 +352,9 @@ class DeduplicationService:
 
         merged = []
         processed_indices = set()
+        texts = [prob.get("problem", "") for prob in problems]
+        similarity_of = self._pairwise_similarity(texts)
+        candidates = self._candidate_indices(texts)
 
         for i, prob1 in enumerate(problems):
             if i in processed_indices:
@@ -260,10 +364,12 @@ class DeduplicationService:
             source_pages = set([prob1.get("source_page")])
             matched_indices = {i}
 
-            for j, prob2 in enumerate(problems[i+1:], start=i+1):
+            for j in candidates[i]:
                 if j in processed_indices:
                     continue
 
+                prob2 = problems[j]
+
                 text1 = prob1.get("problem", "")
                 text2 = prob2.get("problem", "")
 
@@ -287,8 +393,8 @@ class DeduplicationService:
 
                 # Fuzzy match
                 else:
-                    is_match, similarity = self.is_fuzzy_match(text1, text2)
-                    if is_match:
+                    similarity = similarity_of(i, j)
+                    if similarity >= self.fuzzy_threshold:
                         logger.debug(
                             "Fuzzy problem match",
                             problem1=text1,
@@ -381,6 +487,9 @@ class DeduplicationService:
 
         merged = []
         processed_indices = set()
+        test_names = [result.get("test_name", "") for result in results]
+        similarity_of = self._pairwise_similarity(test_names)
+        candidates = self._candidate_indices(test_names)
 
         for i, result1 in enumerate(results):
             if i in processed_indices:
@@ -390,10 +499,12 @@ class DeduplicationService:
             source_pages = set([result1.get("source_page")])
             matched_indices = {i}
 
-            for j, result2 in enumerate(results[i+1:], start=i+1):
+            for j in candidates[i]:
                 if j in processed_indices:
                     continue
 
+                result2 = results[j]
+
                 test1 = result1.get("test_name", "")
                 test2 = result2.get("test_name", "")
 
@@ -402,8 +513,8 @@ class DeduplicationService:
                 if self.is_exact_match(test1, test2):
                     is_same_test = True
                 else:
-                    is_match, similarity = self.is_fuzzy_match(test1, test2)
-                    if is_match:
+                    similarity = similarity_of(i, j)
+                    if similarity >= self.fuzzy_threshold:
                         is_same_test = True
                         logger.debug(
                             "Fuzzy test name match",
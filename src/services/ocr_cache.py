@@ -0,0 +1,48 @@
+"""Content-addressed cache for page OCR results
+
+Keys hash the rendered page pixels (mode, size and raw bytes) together with
+the OCR model name and prompt version, so re-running a PDF - or a page that
+recurs byte-for-byte across documents - skips the Gemini call, while a
+prompt or model change never serves stale text.
+"""
+
+import hashlib
+import os
+from typing import Dict, Optional
+
+from PIL import Image
+
+from ..utils.cache import SQLiteCache
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class OCRCache:
+    """Cache page OCR results keyed by page image content"""
+
+    def __init__(self, cache_dir: str, model_name: str, prompt_version: str, ttl_seconds: int):
+        self.model_name = model_name
+        self.prompt_version = prompt_version
+        self.ttl_seconds = ttl_seconds
+        self._cache = SQLiteCache(os.path.join(cache_dir, "ocr.sqlite3"))
+
+    def key_for(self, image: Image.Image) -> str:
+        """BLAKE2b key for a page image"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.prompt_version}\x1f{self.model_name}\x1f{image.mode}\x1f{image.size}\x1f".encode("utf-8"))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, image: Image.Image, page_number: int) -> Optional[Dict]:
+        """Cached OCR result for a page image (renumbered to page_number), or None"""
+        result = self._cache.get(self.key_for(image))
+        if result is None:
+            return None
+        logger.info("OCR cache hit", page=page_number)
+        result["page_number"] = page_number
+        return result
+
+    def set(self, image: Image.Image, result: Dict) -> None:
+        """Store a page's OCR result"""
+        self._cache.set(self.key_for(image), result, expire=self.ttl_seconds)
@@ -6,8 +6,12 @@ CRITICAL: This service ONLY extracts text. NO medical reasoning, NO correction,
 """
 
 import base64
+import dataclasses
 import io
-from typing import Dict, List
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from statistics import fmean
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Try new API first
 try:
@@ -23,7 +27,9 @@ from PIL import Image
 
 from ..utils.config import get_config
 from ..utils.logger import get_logger
+from ..utils.rate_limit import RateLimiter
 from ..utils.retry import retry_with_backoff
+from .ocr_cache import OCRCache
 
 logger = get_logger(__name__)
 
@@ -70,11 +76,78 @@ Output:
 Completeness is priority - downstream processing will validate context."""
 
 
+# Medical content trips the default filters; OCR must see every page
+if USING_NEW_API:
+    SAFETY_SETTINGS = [
+        types.SafetySetting(
+            category="HARM_CATEGORY_HARASSMENT",
+            threshold="BLOCK_NONE"
+        ),
+        types.SafetySetting(
+            category="HARM_CATEGORY_HATE_SPEECH",
+            threshold="BLOCK_NONE"
+        ),
+        types.SafetySetting(
+            category="HARM_CATEGORY_SEXUALLY_EXPLICIT",
+            threshold="BLOCK_NONE"
+        ),
+        types.SafetySetting(
+            category="HARM_CATEGORY_DANGEROUS_CONTENT",
+            threshold="BLOCK_NONE"
+        ),
+    ]
+else:
+    SAFETY_SETTINGS = {
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+    }
+
+
+# Bump whenever the OCR prompts change so cached page text is invalidated
+OCR_PROMPT_VERSION = "v1"
+
+# Page delimiter lines in batched OCR replies ("### PAGE 3 ###")
+_PAGE_MARKER_RE = re.compile(r"^[ \t]*#{3}\s*PAGE\s+(\d+)\s*#{3}[ \t]*$", re.MULTILINE)
+
+# Output budget for one page's transcription
+PAGE_OUTPUT_TOKENS = 8192
+
+
 class OCRError(Exception):
     """Raised when OCR processing fails"""
     pass
 
 
+def _encode_page_image(image: Image.Image, max_dimension: int, quality: int) -> bytes:
+    """JPEG bytes of a page image, shrunk to fit max_dimension (0 = keep size)
+
+    The SDKs otherwise upload PIL images as lossless PNG, several MB for a
+    300 DPI page.
+    """
+    if max_dimension and max(image.size) > max_dimension:
+        image = image.copy()
+        image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    if image.mode not in ("L", "RGB"):
+        image = image.convert("RGB")
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _finish_reason(response) -> Optional[str]:
+    """Finish reason name of a reply's first candidate (e.g. "STOP", "MAX_TOKENS")"""
+    candidates = getattr(response, "candidates", None)
+    if not candidates:
+        return None
+    reason = getattr(candidates[0], "finish_reason", None)
+    if reason is None:
+        return None
+    return getattr(reason, "name", str(reason))
+
+
 class OCRService:
     """Handle OCR processing using Gemini 3 Pro Preview"""
 
@@ -82,54 +155,63 @@ class OCRService:
         self.config = get_config()
         self.model_name = self.config.ocr_model_name
 
+        # Shared across page OCR worker threads (and their retries)
+        self.rate_limiter = RateLimiter(self.config.ocr_requests_per_minute)
+
+        # Content-addressed cache of page OCR results (skips repeat API calls)
+        # (keyed on the upload size too: downscaled and full-size text differ)
+        self.cache = None
+        if self.config.ocr_cache_enabled:
+            self.cache = OCRCache(
+                self.config.cache_dir,
+                self.model_name,
+                f"{OCR_PROMPT_VERSION}/{self.config.ocr_max_image_dimension}",
+                self.config.ocr_cache_ttl_seconds,
+            )
+
+        # Client, model and generation config are built once and shared by all pages
         if USING_NEW_API:
             self.client = genai.Client(api_key=self.config.gemini_api_key)
+            self.generation_config = types.GenerateContentConfig(
+                temperature=0.0,
+                top_p=1.0,
+                top_k=1,
+                max_output_tokens=PAGE_OUTPUT_TOKENS,
+                safety_settings=SAFETY_SETTINGS,
+                # For Gemini 3: use low thinking level for faster OCR
+                thinking_config=types.ThinkingConfig(
+                    thinking_level=types.ThinkingLevel.LOW
+                ) if "3" in self.model_name else None
+            )
             logger.info("OCR service initialized (NEW API)", model=self.model_name)
         else:
             genai.configure(api_key=self.config.gemini_api_key)
+            self.model = genai.GenerativeModel(self.model_name)
+            self.generation_config = genai.GenerationConfig(
+                temperature=0.0,
+                top_p=1.0,
+                top_k=1,
+                max_output_tokens=PAGE_OUTPUT_TOKENS,
+            )
             logger.info("OCR service initialized (LEGACY API)", model=self.model_name)
 
-    def _get_safety_settings_new_api(self):
-        """Safety settings for new API - BLOCK_NONE for medical content"""
-        return [
-            types.SafetySetting(
-                category="HARM_CATEGORY_HARASSMENT",
-                threshold="BLOCK_NONE"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_HATE_SPEECH",
-                threshold="BLOCK_NONE"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                threshold="BLOCK_NONE"
-            ),
-            types.SafetySetting(
-                category="HARM_CATEGORY_DANGEROUS_CONTENT",
-                threshold="BLOCK_NONE"
-            ),
-        ]
-
-    def _get_safety_settings_legacy_api(self):
-        """Safety settings for legacy API - BLOCK_NONE for medical content"""
-        return {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        }
-
     @retry_with_backoff(
         max_retries=3,
         initial_delay=1.0,
         retryable_exceptions=(Exception,)
     )
-    def extract_text_from_image(self, image: Image.Image, page_number: int) -> Dict[str, any]:
+    def extract_text_from_image(
+        self,
+        image: Image.Image,
+        page_number: int,
+        full_resolution: bool = False,
+    ) -> Dict[str, any]:
         """Extract text from a single page image using Gemini 3 Pro Preview
 
         Args:
             image: PIL Image object
             page_number: Page number for tracking
+            full_resolution: Upload the page without downscaling
 
         Returns:
             Dict with OCR results
@@ -138,27 +220,19 @@ class OCRService:
             OCRError: If extraction fails
         """
         logger.info("Extracting text from page", page=page_number, model=self.model_name)
+        self.rate_limiter.acquire()
 
         try:
             prompt = f"{OCR_SYSTEM_PROMPT}\n\nExtract all text from medical document page {page_number}."
+            image_part = self._image_part(image, full_resolution)
 
             if USING_NEW_API:
                 # New API - for Gemini 3 Pro Preview
                 try:
                     response = self.client.models.generate_content(
                         model=self.model_name,
-                        contents=[prompt, image],
-                        config=types.GenerateContentConfig(
-                            temperature=0.0,
-                            top_p=1.0,
-                            top_k=1,
-                            max_output_tokens=8192,
-                            safety_settings=self._get_safety_settings_new_api(),
-                            # For Gemini 3: use low thinking level for faster OCR
-                            thinking_config=types.ThinkingConfig(
-                                thinking_level=types.ThinkingLevel.LOW
-                            ) if "3" in self.model_name else None
-                        )
+                        contents=[prompt, image_part],
+                        config=self.generation_config,
                     )
                     
                     # Extract text from response
@@ -193,18 +267,11 @@ class OCRService:
 
             else:
                 # Legacy API
-                model = genai.GenerativeModel(self.model_name)
-                
                 try:
-                    response = model.generate_content(
-                        [prompt, image],
-                        generation_config=genai.GenerationConfig(
-                            temperature=0.0,
-                            top_p=1.0,
-                            top_k=1,
-                            max_output_tokens=8192,
-                        ),
-                        safety_settings=self._get_safety_settings_legacy_api()
+                    response = self.model.generate_content(
+                        [prompt, image_part],
+                        generation_config=self.generation_config,
+                        safety_settings=SAFETY_SETTINGS,
                     )
                     
                     # Handle blocked responses
@@ -251,46 +318,7 @@ class OCRService:
                     logger.error("Legacy API call failed", page=page_number, error=str(e))
                     raise
 
-            # Handle empty response
-            if not raw_text or len(raw_text.strip()) < 5:
-                logger.warning("Minimal extraction", page=page_number, text_len=len(raw_text))
-                if not raw_text:
-                    raw_text = f"[UNCLEAR: No text detected on page {page_number}]"
-
-            # Estimate confidence
-            confidence_score = self._estimate_confidence(raw_text)
-
-            # Extract uncertain tokens (Enterprise Improvement #1)
-            uncertain_tokens = self._extract_uncertain_tokens(raw_text)
-
-            # Determine if manual review is needed
-            manual_review_needed = self._should_flag_for_review(confidence_score, uncertain_tokens)
-            review_reasons = self._get_review_reasons(confidence_score, uncertain_tokens, raw_text)
-
-            # Detect layout
-            layout_hints = self._analyze_layout(raw_text)
-
-            result = {
-                "page_number": page_number,
-                "raw_text": raw_text,
-                "confidence_score": confidence_score,
-                "layout_hints": layout_hints,
-                # NEW: Honest uncertainty tracking
-                "uncertain_tokens": uncertain_tokens,
-                "manual_review_required": manual_review_needed,
-                "review_reasons": review_reasons,
-            }
-
-            logger.info(
-                "Text extraction complete",
-                page=page_number,
-                text_length=len(raw_text),
-                confidence=confidence_score,
-                uncertain_tokens=len(uncertain_tokens),
-                manual_review=manual_review_needed,
-            )
-
-            return result
+            return self._page_result_from_text(raw_text, page_number)
 
         except Exception as e:
             logger.error(
@@ -301,6 +329,147 @@ class OCRService:
             )
             raise OCRError(f"Failed to extract text from page {page_number}: {e}")
 
+    @retry_with_backoff(
+        max_retries=1,  # Failed batches fall back to single-page calls
+        initial_delay=1.0,
+        retryable_exceptions=(Exception,)
+    )
+    def extract_text_from_images(self, pages: List[Tuple[int, Image.Image]]) -> Dict[int, Dict[str, any]]:
+        """Extract text from several page images with one Gemini call
+
+        The model transcribes the images in order, opening each page with a
+        "### PAGE <n> ###" marker line. Pages whose section is missing or empty
+        are left out of the result so the caller can OCR them one by one. If
+        the reply did not finish normally (e.g. it hit the output-token limit),
+        the last section may be cut short and is left out as well.
+
+        Args:
+            pages: (page_number, image) pairs in page order
+
+        Returns:
+            OCR results by page number
+
+        Raises:
+            OCRError: If the call fails or no page section can be parsed
+        """
+        page_numbers = [page_number for page_number, _ in pages]
+        logger.info("Extracting text from page batch", pages=page_numbers, model=self.model_name)
+        self.rate_limiter.acquire()
+
+        prompt = (
+            f"{OCR_SYSTEM_PROMPT}\n\n"
+            f"The {len(pages)} images below are medical document pages {page_numbers}, in order.\n"
+            "Transcribe each page completely. Start each page with a line containing only\n"
+            "### PAGE <n> ###\n"
+            "where <n> is that page's number, and never mix text between pages."
+        )
+        contents = [prompt]
+        for page_number, image in pages:
+            contents += [f"### PAGE {page_number} ###", self._image_part(image)]
+
+        max_output_tokens = min(PAGE_OUTPUT_TOKENS * len(pages), self.config.ocr_max_output_tokens)
+        try:
+            if USING_NEW_API:
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=contents,
+                    config=self.generation_config.model_copy(
+                        update={"max_output_tokens": max_output_tokens}
+                    ),
+                )
+            else:
+                response = self.model.generate_content(
+                    contents,
+                    generation_config=dataclasses.replace(
+                        self.generation_config, max_output_tokens=max_output_tokens
+                    ),
+                    safety_settings=SAFETY_SETTINGS,
+                )
+            reply = response.text or ""
+        except Exception as e:
+            logger.error("Batched OCR call failed", pages=page_numbers, error=str(e))
+            raise OCRError(f"Failed to extract text from pages {page_numbers}: {e}")
+
+        sections = _PAGE_MARKER_RE.split(reply)
+        # split() yields [preamble, n1, text1, n2, text2, ...]
+        parsed = list(zip(sections[1::2], sections[2::2]))
+        finish_reason = _finish_reason(response)
+        if finish_reason not in (None, "STOP") and parsed:
+            # The reply stopped mid-page; its last section may be truncated
+            logger.warning(
+                "Batched OCR reply incomplete, dropping last page section",
+                pages=page_numbers,
+                finish_reason=finish_reason,
+                dropped_page=int(parsed[-1][0]),
+            )
+            parsed.pop()
+
+        wanted = set(page_numbers)
+        results = {}
+        for number, text in parsed:
+            page_number = int(number)
+            text = text.strip()
+            if page_number in wanted and page_number not in results and text:
+                results[page_number] = self._page_result_from_text(text, page_number)
+
+        if not results:
+            raise OCRError(f"No page sections found in batched OCR reply for pages {page_numbers}")
+        return results
+
+    def _image_part(self, image: Image.Image, full_resolution: bool = False):
+        """Request content part for a page image (JPEG, downscaled unless full_resolution)"""
+        data = _encode_page_image(
+            image,
+            0 if full_resolution else self.config.ocr_max_image_dimension,
+            self.config.ocr_jpeg_quality,
+        )
+        if USING_NEW_API:
+            return types.Part.from_bytes(data=data, mime_type="image/jpeg")
+        return {"mime_type": "image/jpeg", "data": data}
+
+    def _page_result_from_text(self, raw_text: str, page_number: int) -> Dict[str, any]:
+        """Build a page's OCR result (confidence, uncertainty, layout) from its text"""
+        # Handle empty response
+        if not raw_text or len(raw_text.strip()) < 5:
+            logger.warning("Minimal extraction", page=page_number, text_len=len(raw_text))
+            if not raw_text:
+                raw_text = f"[UNCLEAR: No text detected on page {page_number}]"
+
+        # Estimate confidence
+        confidence_score = self._estimate_confidence(raw_text)
+
+        # Extract uncertain tokens (Enterprise Improvement #1)
+        uncertain_tokens = self._extract_uncertain_tokens(raw_text)
+
+        # Determine if manual review is needed
+        manual_review_needed = self._should_flag_for_review(confidence_score, uncertain_tokens)
+        review_reasons = self._get_review_reasons(confidence_score, uncertain_tokens, raw_text)
+
+        # Detect layout
+        layout_hints = self._analyze_layout(raw_text)
+
+        result = {
+            "page_number": page_number,
+            "raw_text": raw_text,
+            "confidence_score": confidence_score,
+            "layout_hints": layout_hints,
+            # NEW: Honest uncertainty tracking
+            "uncertain_tokens": uncertain_tokens,
+            "manual_review_required": manual_review_needed,
+            "review_reasons": review_reasons,
+        }
+
+        logger.info(
+            "Text extraction complete",
+            page=page_number,
+            text_length=len(raw_text),
+            confidence=confidence_score,
+            uncertain_tokens=len(uncertain_tokens),
+            manual_review=manual_review_needed,
+        )
+
+        return result
+
     def _estimate_confidence(self, text: str) -> float:
         """Estimate OCR confidence with realistic scoring
 
@@ -487,43 +656,145 @@ class OCRService:
 
         return layout_hints
 
-    def process_pages(self, images: List[Image.Image], progress_callback=None) -> List[Dict[str, any]]:
-        """Process multiple pages
-
-        Args:
-            images: List of PIL Image objects
-            progress_callback: Optional callback function(page_num, total_pages) for progress tracking
+    def _ocr_page_or_placeholder(self, image: Image.Image, page_number: int) -> Dict[str, any]:
+        """extract_text_from_image, falling back to an error placeholder result"""
+        try:
+            return self.extract_text_from_image(image, page_number=page_number)
+        except OCRError as e:
+            logger.error("Page processing failed", page=page_number, error=str(e))
+            return {
+                "page_number": page_number,
+                "raw_text": f"[UNCLEAR: OCR processing failed - {str(e)}]",
+                "confidence_score": 0.0,
+                "layout_hints": {"has_error": True},
+            }
 
-        Returns:
-            List of OCR results
-        """
-        logger.info("Processing pages", total_pages=len(images), model=self.model_name)
+    def _retry_at_full_resolution(self, image: Image.Image, result: Dict[str, any]) -> Dict[str, any]:
+        """Re-OCR a low-confidence downscaled page at full size; keep the better result"""
+        floor = self.config.ocr_full_resolution_below_confidence
+        max_dimension = self.config.ocr_max_image_dimension
+        if (
+            not floor
+            or not max_dimension
+            or max(image.size) <= max_dimension
+            or result["confidence_score"] >= floor
+            or result["layout_hints"].get("has_error")
+        ):
+            return result
 
-        results = []
-        total_pages = len(images)
+        page_number = result["page_number"]
+        logger.info(
+            "Low OCR confidence on downscaled page, retrying at full resolution",
+            page=page_number,
+            confidence=result["confidence_score"],
+        )
+        try:
+            retried = self.extract_text_from_image(image, page_number, full_resolution=True)
+        except OCRError as e:
+            logger.warning("Full-resolution OCR retry failed", page=page_number, error=str(e))
+            return result
+        return retried if retried["confidence_score"] > result["confidence_score"] else result
 
-        for i, image in enumerate(images, start=1):
-            # Call progress callback if provided
-            if progress_callback:
-                progress_callback(i, total_pages)
+    def _ocr_page_group(self, group: List[Tuple[int, Image.Image]]) -> Dict[int, Dict[str, any]]:
+        """OCR results by page number for a group of (page_number, image) pairs
 
+        Pages found in the OCR cache are served from it. Of the rest, groups
+        of several pages go out as one batched call; any page the batch does
+        not return (or the whole group, if the call fails) is OCR'd alone.
+        Downscaled pages that come back with low confidence get one more try
+        at full resolution.
+        """
+        results = {}
+        if self.cache is not None:
+            for page_number, image in group:
+                cached = self.cache.get(image, page_number)
+                if cached is not None:
+                    results[page_number] = cached
+        misses = [(page_number, image) for page_number, image in group if page_number not in results]
+
+        if len(misses) > 1:
             try:
-                ocr_result = self.extract_text_from_image(image, page_number=i)
-                results.append(ocr_result)
+                results.update(self.extract_text_from_images(misses))
             except OCRError as e:
-                logger.error("Page processing failed", page=i, error=str(e))
-                results.append({
-                    "page_number": i,
-                    "raw_text": f"[UNCLEAR: OCR processing failed - {str(e)}]",
-                    "confidence_score": 0.0,
-                    "layout_hints": {"has_error": True},
-                })
+                logger.warning(
+                    "Batched OCR failed, using single-page calls",
+                    pages=[page_number for page_number, _ in misses],
+                    error=str(e),
+                )
+        for page_number, image in misses:
+            if page_number not in results:
+                results[page_number] = self._ocr_page_or_placeholder(image, page_number)
+            results[page_number] = self._retry_at_full_resolution(image, results[page_number])
+            # Failed pages are not cached so a rerun tries them again
+            if self.cache is not None and not results[page_number]["layout_hints"].get("has_error"):
+                self.cache.set(image, results[page_number])
+        return results
+
+    def process_pages(
+        self,
+        images: Iterable[Image.Image],
+        progress_callback=None,
+        total_pages: Optional[int] = None,
+    ) -> List[Dict[str, any]]:
+        """Process multiple pages
 
-        avg_confidence = sum(r["confidence_score"] for r in results) / len(results) if results else 0.0
+        Args:
+            images: PIL Image objects in page order - a list, or an iterator
+                that is still rasterizing (e.g. PDFService.iter_page_images)
+            progress_callback: Optional callback function(pages_done, total_pages) for progress tracking
+            total_pages: Page count when images is an iterator without len()
+
+        Returns:
+            List of OCR results
+        """
+        if total_pages is None:
+            total_pages = len(images)
+        logger.info("Processing pages", total_pages=total_pages, model=self.model_name)
+
+        # Pages are OCR'd concurrently (each call is blocked on Gemini I/O) in
+        # groups of ocr_batch_size pages per call, and slotted by page number.
+        # In-flight groups are bounded so an image iterator that is still
+        # rasterizing is not drained into memory.
+        results_by_page = {}
+        batch_size = max(1, self.config.ocr_batch_size)
+        max_workers = max(1, self.config.ocr_concurrency)
+        max_in_flight = max_workers * 2
+        pending = set()
+
+        def collect(done) -> None:
+            for future in done:
+                pending.discard(future)
+                results_by_page.update(future.result())
+                # Called from this thread, so UI callbacks (Streamlit) stay safe
+                if progress_callback:
+                    progress_callback(len(results_by_page), total_pages)
+
+        def submit(group) -> None:
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(self._ocr_page_group, group))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            group = []
+            for page_number, image in enumerate(images, start=1):
+                group.append((page_number, image))
+                if len(group) >= batch_size:
+                    submit(group)
+                    group = []
+            if group:
+                submit(group)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        results = [results_by_page[page_number] for page_number in sorted(results_by_page)]
+
+        avg_confidence = fmean(r["confidence_score"] for r in results) if results else 0.0
 
         logger.info(
             "Page processing complete",
-            total_pages=len(images),
+            total_pages=len(results),
             successful_pages=sum(1 for r in results if r["confidence_score"] > 0),
             avg_confidence=round(avg_confidence, 2),
         )
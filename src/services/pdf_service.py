@@ -2,12 +2,19 @@
 
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 
 from pdf2image import convert_from_path
 from PIL import Image
 from pypdf import PdfReader
 
+# Optional: PyMuPDF rasterizes in-process, faster and leaner than poppler's
+# pdftoppm subprocess (pip install pymupdf)
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
 from ..utils.config import get_config
 from ..utils.logger import get_logger
 
@@ -114,7 +121,7 @@ class PDFService:
         logger.info("Extracting pages as images", pdf_path=pdf_path, dpi=dpi)
 
         try:
-            images = convert_from_path(pdf_path, dpi=dpi)
+            images = self._render_page_range(pdf_path, dpi)
 
             if not images:
                 raise PDFValidationError("No images extracted from PDF")
@@ -132,6 +139,69 @@ class PDFService:
             logger.error("Page extraction failed", pdf_path=pdf_path, error=str(e))
             raise PDFValidationError(f"Failed to extract pages: {str(e)}")
 
+    def iter_page_images(
+        self,
+        pdf_path: str,
+        dpi: int = 300,
+        page_count: Optional[int] = None,
+        pages_per_render: int = 4,
+    ) -> Iterator[Image.Image]:
+        """Rasterize PDF pages incrementally, a few pages per render call
+
+        Unlike extract_pages_as_images, pages are yielded as soon as their
+        range is rendered, so OCR can start on page 1 while later pages are
+        still being rasterized (see utils.prefetch).
+
+        Args:
+            pdf_path: Path to PDF file (already validated)
+            dpi: DPI for image extraction (default 300 for good quality)
+            page_count: Page count from validate_pdf (read from the PDF if omitted)
+            pages_per_render: Pages rendered per converter call
+
+        Yields:
+            PIL Image objects, one per page, in page order
+
+        Raises:
+            PDFValidationError: If extraction fails
+        """
+        if page_count is None:
+            page_count = len(PdfReader(pdf_path).pages)
+
+        logger.info("Streaming pages as images", pdf_path=pdf_path, dpi=dpi, page_count=page_count)
+
+        for first_page in range(1, page_count + 1, pages_per_render):
+            last_page = min(first_page + pages_per_render - 1, page_count)
+            try:
+                images = self._render_page_range(pdf_path, dpi, first_page, last_page)
+            except Exception as e:
+                logger.error("Page extraction failed", pdf_path=pdf_path, first_page=first_page, error=str(e))
+                raise PDFValidationError(f"Failed to extract pages {first_page}-{last_page}: {str(e)}")
+
+            yield from images
+
+    @staticmethod
+    def _render_page_range(
+        pdf_path: str,
+        dpi: int,
+        first_page: int = 1,
+        last_page: Optional[int] = None,
+    ) -> List[Image.Image]:
+        """Render 1-based pages first_page..last_page (default: to the end) as RGB images
+
+        Uses PyMuPDF when installed, otherwise pdf2image (poppler).
+        """
+        if pymupdf is None:
+            return convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
+
+        matrix = pymupdf.Matrix(dpi / 72, dpi / 72)
+        images = []
+        with pymupdf.open(pdf_path) as doc:
+            end = doc.page_count if last_page is None else min(last_page, doc.page_count)
+            for index in range(first_page - 1, end):
+                pix = doc[index].get_pixmap(matrix=matrix, alpha=False)
+                images.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+        return images
+
     def get_page_quality_info(self, image: Image.Image, page_number: int) -> Dict[str, any]:
         """Analyze image quality for OCR suitability
 
@@ -166,11 +236,16 @@ class PDFService:
 
         return quality_info
 
-    def process_pdf(self, pdf_path: str) -> Dict[str, any]:
+    def process_pdf(self, pdf_path: str, lazy: bool = False) -> Dict[str, any]:
         """Full PDF processing: validate + extract pages
 
+        With lazy=True, "images" is a generator that rasterizes pages as they
+        are consumed, so only the pages in flight are held in memory;
+        "quality_info" and "warnings" fill in as pages are yielded.
+
         Args:
             pdf_path: Path to PDF file
+            lazy: Yield page images on demand instead of rendering them all up front
 
         Returns:
             Dict with metadata and extracted images
@@ -181,6 +256,25 @@ class PDFService:
         # Step 1: Validate
         metadata = self.validate_pdf(pdf_path)
 
+        if lazy:
+            quality_info, warnings = [], []
+
+            def pages() -> Iterator[Image.Image]:
+                images = self.iter_page_images(pdf_path, page_count=metadata["page_count"])
+                for page_number, image in enumerate(images, start=1):
+                    info = self.get_page_quality_info(image, page_number)
+                    quality_info.append(info)
+                    if info.get("warning"):
+                        warnings.append(info["warning"])
+                    yield image
+
+            return {
+                "metadata": metadata,
+                "images": pages(),
+                "quality_info": quality_info,
+                "warnings": warnings,
+            }
+
         # Step 2: Extract pages as images
         images = self.extract_pages_as_images(pdf_path)
 
@@ -0,0 +1,47 @@
+"""Content-addressed cache for structured visit results
+
+Keys hash everything that shapes the structuring prompt - OCR chunk text,
+visit ID, source pages - together with the model name and prompt version, so
+a prompt or model change never serves stale structures.
+"""
+
+import hashlib
+import os
+from typing import Dict, Optional
+
+from ..utils.cache import SQLiteCache
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StructureCache:
+    """Cache structure_visit output keyed by chunk content"""
+
+    def __init__(self, cache_dir: str, model_name: str, prompt_version: str, ttl_seconds: int):
+        self.model_name = model_name
+        self.prompt_version = prompt_version
+        self.ttl_seconds = ttl_seconds
+        self._cache = SQLiteCache(os.path.join(cache_dir, "structuring.sqlite3"))
+
+    def key_for(self, chunk: Dict[str, any]) -> str:
+        """SHA-256 key for a visit chunk"""
+        material = "\x1f".join([
+            self.prompt_version,
+            self.model_name,
+            str(chunk["visit_id"]),
+            str(chunk["pages"]),
+            chunk["raw_text"],
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, chunk: Dict[str, any]) -> Optional[Dict]:
+        """Cached visit data for a chunk, or None"""
+        visit_data = self._cache.get(self.key_for(chunk))
+        if visit_data is not None:
+            logger.info("Structuring cache hit", visit_id=chunk["visit_id"])
+        return visit_data
+
+    def set(self, chunk: Dict[str, any], visit_data: Dict) -> None:
+        """Store visit data for a chunk"""
+        self._cache.set(self.key_for(chunk), visit_data, expire=self.ttl_seconds)
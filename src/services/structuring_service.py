@@ -5,15 +5,41 @@ NO hallucination, NO invention, NO silent correction.
 Follows LLM_SYSTEM_PROMPT.md - ROLE B: STRUCTURING ENGINE
 """
 
+import asyncio
 import json
-from typing import Dict, List
+import re
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from statistics import fmean
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 
 import google.generativeai as genai
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
-from ..models.canonical_schema import MedicalDocument
+# Optional: faster JSON parsing of model replies (pip install orjson)
+try:
+    import orjson
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
+
+# Optional: Aho-Corasick automaton for source-excerpt lookup (pip install pyahocorasick)
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from pydantic import ValidationError
+
+from ..models.canonical_schema import MedicalDocument, Visit
 from ..utils.config import get_config
 from ..utils.logger import get_logger
-from ..utils.retry import retry_with_backoff
+from ..utils.rate_limit import RateLimiter
+from ..utils.retry import TRANSIENT_API_ERRORS, retry_with_backoff
+from ..utils.tokens import estimate_tokens
+from .structure_cache import StructureCache
 
 logger = get_logger(__name__)
 
@@ -90,6 +116,41 @@ Return ONLY valid JSON following this structure:
 
 CRITICAL: Return ONLY the JSON object. No explanations, no markdown formatting."""
 
+# Bump whenever the structuring prompts change so cached structures are invalidated
+PROMPT_VERSION = "v2"
+
+
+# Medical content trips the default filters; structuring must see all of it
+SAFETY_SETTINGS = [
+    {
+        "category": HarmCategory.HARM_CATEGORY_HARASSMENT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+    {
+        "category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+        "threshold": HarmBlockThreshold.BLOCK_NONE,
+    },
+]
+
+# Leading ```json / ``` fence and trailing ``` fence around a model reply
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+GENERATION_CONFIG = genai.GenerationConfig(
+    temperature=0.0,  # Deterministic
+    top_p=1.0,
+    top_k=1,
+    max_output_tokens=16384,  # Increased for longer documents
+    response_mime_type="application/json",  # JSON mode: bare JSON, no fences or prose
+)
+
 
 class StructuringError(Exception):
     """Raised when structuring fails"""
@@ -99,28 +160,54 @@ class StructuringError(Exception):
 class StructuringService:
     """Handle medical data structuring using Gemini 2.5 Flash"""
 
+    # Max combined OCR tokens per batched call (see _plan_batches)
+    BATCH_TOKEN_BUDGET = 3000
+    # Estimated tokens of system prompt and instructions around the OCR text
+    PROMPT_OVERHEAD_TOKENS = 1200
+
     def __init__(self):
         self.config = get_config()
 
         # Configure Gemini API
         genai.configure(api_key=self.config.gemini_api_key)
 
+        # Shared across structuring worker threads (and their retries)
+        self.rate_limiter = RateLimiter(self.config.structuring_requests_per_minute)
+
+        # Content-addressed cache of structured visits (skips repeat API calls)
+        self.cache = None
+        if self.config.structuring_cache_enabled:
+            self.cache = StructureCache(
+                self.config.cache_dir,
+                self.config.structuring_model_name,
+                PROMPT_VERSION,
+                self.config.structuring_cache_ttl_seconds,
+            )
+
+        # Server-side cached system prompt (see _get_model)
+        self._context_lock = threading.Lock()
+        self._context_model = None
+        self._context_expires_at = 0.0
+        self._context_cache_enabled = self.config.structuring_context_cache_enabled
+
         # Model name is configurable via .env file (STRUCTURING_MODEL_NAME)
         try:
-            self.model = genai.GenerativeModel(self.config.structuring_model_name)
+            self.model = genai.GenerativeModel(
+                self.config.structuring_model_name,
+                system_instruction=STRUCTURING_SYSTEM_PROMPT,
+            )
             logger.info("Structuring service initialized", model=self.config.structuring_model_name)
         except Exception as e:
             logger.error("Failed to initialize structuring model", error=str(e))
             raise StructuringError(f"Model initialization failed: {e}")
 
-    @retry_with_backoff(
-        max_retries=3,
-        initial_delay=1.0,
-        retryable_exceptions=(Exception,)
-    )
     def structure_visit(self, chunk: Dict[str, any]) -> Dict[str, any]:
         """Structure a single visit chunk into canonical format
 
+        Visits whose prompt would exceed STRUCTURING_MAX_INPUT_TOKENS (estimated
+        locally, no API call) are split on line boundaries, structured part by
+        part and merged back into one visit.
+
         Args:
             chunk: Visit chunk with raw_text and metadata
 
@@ -130,18 +217,93 @@ class StructuringService:
         Raises:
             StructuringError: If structuring fails
         """
-        logger.info("Structuring visit", visit_id=chunk["visit_id"], pages=chunk["pages"])
+        if self._is_trivial_chunk(chunk):
+            return self._insufficient_text_visit(chunk)
+
+        try:
+            parts = self._split_oversized(chunk)
+            if parts is None:
+                return self._structure_visit_call(chunk)
+            results = [self._structure_visit_call(part) for part in parts]
+            return _merge_split_visit(chunk, parts, results)
+        except TRANSIENT_API_ERRORS as e:
+            # Retries exhausted
+            raise StructuringError(f"Failed to structure visit {chunk['visit_id']}: {e}") from e
+
+    async def structure_visit_async(self, chunk: Dict[str, any]) -> Dict[str, any]:
+        """Async counterpart of structure_visit (generate_content_async)"""
+        if self._is_trivial_chunk(chunk):
+            return self._insufficient_text_visit(chunk)
+
+        try:
+            parts = self._split_oversized(chunk)
+            if parts is None:
+                return await self._structure_visit_call_async(chunk)
+            results = [await self._structure_visit_call_async(part) for part in parts]
+            return _merge_split_visit(chunk, parts, results)
+        except TRANSIENT_API_ERRORS as e:
+            # Retries exhausted
+            raise StructuringError(f"Failed to structure visit {chunk['visit_id']}: {e}") from e
+
+    @retry_with_backoff(
+        max_retries=3,
+        initial_delay=1.0,
+        retryable_exceptions=TRANSIENT_API_ERRORS
+    )
+    def _structure_visit_call(self, chunk: Dict[str, any]) -> Dict[str, any]:
+        """One Gemini call structuring a visit chunk (see structure_visit)"""
+        cached = self._start_visit_call(chunk)
+        if cached is not None:
+            return cached
+
+        try:
+            structured_data = self._generate_json(self._visit_prompt(chunk))
+            return self._visit_from_reply(structured_data, chunk)
+
+        except (StructuringError, *TRANSIENT_API_ERRORS):
+            # Transient API errors propagate unwrapped so the retry decorator sees them
+            raise
+        except Exception as e:
+            raise self._visit_call_error(chunk, e)
+
+    @retry_with_backoff(
+        max_retries=3,
+        initial_delay=1.0,
+        retryable_exceptions=TRANSIENT_API_ERRORS
+    )
+    async def _structure_visit_call_async(self, chunk: Dict[str, any]) -> Dict[str, any]:
+        """Async counterpart of _structure_visit_call"""
+        cached = self._start_visit_call(chunk)
+        if cached is not None:
+            return cached
 
         try:
-            # Prepare line-numbered OCR text for better traceability
-            lines = chunk['raw_text'].split('\n')
-            line_numbered_text = '\n'.join([f"{i+1:4d}| {line}" for i, line in enumerate(lines)])
+            structured_data = await self._generate_json_async(self._visit_prompt(chunk))
+            return self._visit_from_reply(structured_data, chunk)
+
+        except (StructuringError, *TRANSIENT_API_ERRORS):
+            raise
+        except Exception as e:
+            raise self._visit_call_error(chunk, e)
+
+    def _start_visit_call(self, chunk: Dict[str, any]) -> Optional[Dict[str, any]]:
+        """Log a single-visit call and return its cached visit, if any"""
+        logger.info("Structuring visit", visit_id=chunk["visit_id"], pages=chunk["pages"])
 
-            # Prepare prompt
-            prompt = f"""{STRUCTURING_SYSTEM_PROMPT}
+        if self.cache is None:
+            return None
+        return self.cache.get(chunk)
 
-OCR TEXT WITH LINE NUMBERS (from pages {chunk['pages']}):
-{line_numbered_text}
+    @staticmethod
+    def _visit_call_error(chunk: Dict[str, any], error: Exception) -> StructuringError:
+        """Log a failed single-visit call and wrap the error for the caller"""
+        logger.error("Structuring failed", visit_id=chunk["visit_id"], error=str(error))
+        return StructuringError(f"Failed to structure visit {chunk['visit_id']}: {error}")
+
+    def _visit_prompt(self, chunk: Dict[str, any]) -> str:
+        """Per-visit prompt with line-numbered OCR text for better traceability"""
+        return f"""OCR TEXT WITH LINE NUMBERS (from pages {chunk['pages']}):
+{self._line_numbered(chunk['raw_text'])}
 
 Extract structured data into JSON format. Remember:
 - Preserve exact wording (no corrections)
@@ -153,98 +315,439 @@ Extract structured data into JSON format. Remember:
 - Source pages: {chunk['pages']}
 """
 
-            # Call Gemini API with safety settings for medical content
-            from google.generativeai.types import HarmCategory, HarmBlockThreshold
-
-            safety_settings = [
-                {
-                    "category": HarmCategory.HARM_CATEGORY_HARASSMENT,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-                {
-                    "category": HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                    "threshold": HarmBlockThreshold.BLOCK_NONE,
-                },
-            ]
-
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=0.0,  # Deterministic
-                    top_p=1.0,
-                    top_k=1,
-                    max_output_tokens=16384,  # Increased for longer documents
-                ),
-                safety_settings=safety_settings,
-            )
+    def _visit_from_reply(self, structured_data: Dict, chunk: Dict[str, any]) -> Dict[str, any]:
+        """Finalize and cache the visit from a single-visit model reply"""
+        # Extract visit data (handle both single visit and visits array)
+        if "visits" in structured_data and structured_data["visits"]:
+            visit_data = structured_data["visits"][0]
+        else:
+            visit_data = structured_data
+
+        visit_data = self._finalize_visit(visit_data, chunk)
+        if self.cache is not None:
+            self.cache.set(chunk, visit_data)
+
+        logger.info(
+            "Visit structuring complete",
+            visit_id=chunk["visit_id"],
+            has_medications=len(visit_data.get("medications", [])) > 0,
+            has_problems=len(visit_data.get("problem_list", [])) > 0,
+            has_results=len(visit_data.get("results", [])) > 0,
+        )
+
+        return visit_data
+
+    def _split_oversized(self, chunk: Dict[str, any]) -> Optional[List[Dict[str, any]]]:
+        """Line-bounded sub-chunks of a visit over the prompt token budget, else None"""
+        text_budget = self.config.structuring_max_input_tokens - self.PROMPT_OVERHEAD_TOKENS
+        if estimate_tokens(chunk["raw_text"]) <= text_budget:
+            return None
 
-            # Parse JSON response
-            response_text = response.text.strip()
+        parts, current, current_tokens = [], [], 0
+        for line in chunk["raw_text"].split("\n"):
+            # +3 covers the "NNNN| " line-number prefix
+            line_tokens = estimate_tokens(line) + 3
+            if current and current_tokens + line_tokens > text_budget:
+                parts.append(current)
+                current, current_tokens = [], 0
+            current.append(line)
+            current_tokens += line_tokens
+        parts.append(current)
 
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]  # Remove ```json
-            if response_text.startswith("```"):
-                response_text = response_text[3:]  # Remove ```
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]  # Remove trailing ```
+        logger.warning(
+            "Visit exceeds prompt token budget, structuring in parts",
+            visit_id=chunk["visit_id"],
+            parts=len(parts),
+        )
+        return [{**chunk, "raw_text": "\n".join(part_lines)} for part_lines in parts]
 
-            response_text = response_text.strip()
+    def structure_visits_batch(self, chunks: List[Dict[str, any]]) -> List[Dict[str, any]]:
+        """Structure several visit chunks with one Gemini call
 
-            # Parse JSON
+        The chunks share a single prompt, delimited per visit, and the model
+        returns one entry per visit_id. Any visit that is missing from the
+        response or fails schema validation is re-structured on its own with
+        structure_visit(); a visit that fails there too gets a placeholder.
+
+        Args:
+            chunks: Visit chunks with raw_text and metadata
+
+        Returns:
+            Structured visit data, in the same order as chunks
+        """
+        if len(chunks) == 1:
+            return [self._structure_or_placeholder(chunks[0])]
+
+        cached, pending = self._cached_and_pending(chunks)
+
+        batched = {}
+        if len(pending) > 1:
+            logger.info("Structuring visit batch", visit_ids=[chunk["visit_id"] for chunk in pending])
             try:
-                structured_data = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                logger.error("Invalid JSON from model", response=response_text[:200], error=str(e))
-                raise StructuringError(f"Model returned invalid JSON: {e}")
-
-            # Extract visit data (handle both single visit and visits array)
-            if "visits" in structured_data and structured_data["visits"]:
-                visit_data = structured_data["visits"][0]
-            else:
-                visit_data = structured_data
-
-            # Ensure required fields
-            visit_data.setdefault("visit_id", chunk["visit_id"])
-            visit_data.setdefault("raw_source_pages", chunk["pages"])
-            visit_data.setdefault("visit_date", chunk.get("visit_date"))
-
-            # Fix: Convert None to empty strings for string fields (Pydantic v2 strict typing)
-            string_fields = [
-                "reason_for_visit",
-                "history_of_present_illness",
-                "assessment"
-            ]
-            for field in string_fields:
-                if visit_data.get(field) is None:
-                    visit_data[field] = ""
-
-            # Enterprise Improvement #2: Enrich with source excerpts if missing
-            visit_data = self._enrich_source_excerpts(visit_data, chunk['raw_text'])
-
-            logger.info(
-                "Visit structuring complete",
+                batched = self._structure_batch_call(pending)
+            except (StructuringError, *TRANSIENT_API_ERRORS) as e:
+                logger.warning("Batch structuring failed, using single-visit calls", error=str(e))
+
+        visits_data = []
+        for chunk in chunks:
+            visit_data = cached.get(chunk["visit_id"]) or batched.get(chunk["visit_id"])
+            if visit_data is None:
+                visit_data = self._structure_or_placeholder(chunk)
+            visits_data.append(visit_data)
+
+        return visits_data
+
+    async def structure_visits_batch_async(self, chunks: List[Dict[str, any]]) -> List[Dict[str, any]]:
+        """Async counterpart of structure_visits_batch"""
+        if len(chunks) == 1:
+            return [await self._structure_or_placeholder_async(chunks[0])]
+
+        cached, pending = self._cached_and_pending(chunks)
+
+        batched = {}
+        if len(pending) > 1:
+            logger.info("Structuring visit batch", visit_ids=[chunk["visit_id"] for chunk in pending])
+            try:
+                batched = await self._structure_batch_call_async(pending)
+            except (StructuringError, *TRANSIENT_API_ERRORS) as e:
+                logger.warning("Batch structuring failed, using single-visit calls", error=str(e))
+
+        visits_data = []
+        for chunk in chunks:
+            visit_data = cached.get(chunk["visit_id"]) or batched.get(chunk["visit_id"])
+            if visit_data is None:
+                visit_data = await self._structure_or_placeholder_async(chunk)
+            visits_data.append(visit_data)
+
+        return visits_data
+
+    def _all_cached_visits(self, chunks: List[Dict[str, any]]) -> Optional[List[Dict[str, any]]]:
+        """Visit data for every chunk when the whole document is cached, else None
+
+        Lets a re-run of an unchanged document skip batch planning and the
+        worker pool. Near-empty chunks never reach the model, so they count as
+        cached; oversized visits are cached per part and take the normal path.
+        """
+        if self.cache is None:
+            return None
+
+        visits_data = []
+        for chunk in chunks:
+            if self._is_trivial_chunk(chunk):
+                visits_data.append(self._insufficient_text_visit(chunk))
+                continue
+            visit_data = self.cache.get(chunk)
+            if visit_data is None:
+                return None
+            visits_data.append(visit_data)
+
+        logger.info("All visits served from structuring cache", total_visits=len(visits_data))
+        return visits_data
+
+    def _cached_and_pending(self, chunks: List[Dict[str, any]]) -> Tuple[Dict[str, Dict], List[Dict[str, any]]]:
+        """Split a batch into cached visits (by visit_id) and chunks still to send"""
+        cached = {}
+        if self.cache is not None:
+            for chunk in chunks:
+                visit_data = self.cache.get(chunk)
+                if visit_data is not None:
+                    cached[chunk["visit_id"]] = visit_data
+        pending = [
+            chunk for chunk in chunks
+            if chunk["visit_id"] not in cached and not self._is_trivial_chunk(chunk)
+        ]
+        return cached, pending
+
+    @retry_with_backoff(
+        max_retries=2,
+        initial_delay=1.0,
+        retryable_exceptions=TRANSIENT_API_ERRORS
+    )
+    def _structure_batch_call(self, chunks: List[Dict[str, any]]) -> Dict[str, Dict]:
+        """One streamed Gemini call for a batch of chunks
+
+        Each visit object is finalized and validated as soon as it completes
+        in the stream, overlapping that work with generation of later visits.
+
+        Returns:
+            Validated visit data by visit_id (invalid or missing visits omitted)
+        """
+        chunks_by_id = {chunk["visit_id"]: chunk for chunk in chunks}
+        accepted = {}
+        scanner = _JSONArrayStream("visits")
+        pieces = []
+        for piece in self._stream_text(self._batch_prompt(chunks)):
+            pieces.append(piece)
+            for visit in scanner.feed(piece):
+                self._accept_batched_visit(visit, chunks_by_id, accepted)
+
+        self._finish_batch_reply(scanner, pieces, chunks_by_id, accepted)
+        return accepted
+
+    @retry_with_backoff(
+        max_retries=2,
+        initial_delay=1.0,
+        retryable_exceptions=TRANSIENT_API_ERRORS
+    )
+    async def _structure_batch_call_async(self, chunks: List[Dict[str, any]]) -> Dict[str, Dict]:
+        """Async counterpart of _structure_batch_call"""
+        chunks_by_id = {chunk["visit_id"]: chunk for chunk in chunks}
+        accepted = {}
+        scanner = _JSONArrayStream("visits")
+        pieces = []
+        async for piece in self._stream_text_async(self._batch_prompt(chunks)):
+            pieces.append(piece)
+            for visit in scanner.feed(piece):
+                self._accept_batched_visit(visit, chunks_by_id, accepted)
+
+        self._finish_batch_reply(scanner, pieces, chunks_by_id, accepted)
+        return accepted
+
+    def _batch_prompt(self, chunks: List[Dict[str, any]]) -> str:
+        """Multi-visit prompt, one delimited line-numbered section per visit"""
+        sections = "\n\n".join(
+            f"=== VISIT {chunk['visit_id']} (pages {chunk['pages']}) ===\n"
+            f"{self._line_numbered(chunk['raw_text'])}"
+            for chunk in chunks
+        )
+        return f"""The OCR text below contains {len(chunks)} separate visits. Each visit starts with a
+"=== VISIT <visit_id> (pages ...) ===" line and its own line numbering.
+
+OCR TEXT WITH LINE NUMBERS:
+{sections}
+
+Extract structured data into JSON format. Remember:
+- Return {{"visits": [...]}} with exactly one object per visit above, in the same order
+- Set each object's visit_id to the id from its === VISIT === line
+- Never mix data between visits
+- Preserve exact wording (no corrections)
+- Use null for missing data
+- Mark unclear sections with [UNCLEAR]
+- Track source pages AND line numbers (within that visit) for every field
+- Include exact text excerpts (40-60 chars) for traceability
+"""
+
+    def _finish_batch_reply(
+        self,
+        scanner: "_JSONArrayStream",
+        pieces: List[str],
+        chunks_by_id: Dict[str, Dict],
+        accepted: Dict,
+    ) -> None:
+        """Parse the full batch reply when nothing recognisable streamed"""
+        if scanner.items_seen:
+            return
+
+        structured_data = self._parse_json_text("".join(pieces))
+        visits = structured_data.get("visits") if isinstance(structured_data, dict) else None
+        if not isinstance(visits, list):
+            raise StructuringError("Batch response has no visits array")
+        for visit in visits:
+            self._accept_batched_visit(visit, chunks_by_id, accepted)
+
+    def _accept_batched_visit(self, visit: Dict, chunks_by_id: Dict[str, Dict], accepted: Dict):
+        """Finalize and validate one visit from a batch response"""
+        chunk = chunks_by_id.get(visit.get("visit_id")) if isinstance(visit, dict) else None
+        if chunk is None or chunk["visit_id"] in accepted:
+            return
+
+        try:
+            visit_data = self._finalize_visit(visit, chunk)
+            Visit.model_validate(visit_data)
+        except (ValidationError, AttributeError, TypeError) as e:
+            logger.warning(
+                "Batched visit invalid, retrying alone",
                 visit_id=chunk["visit_id"],
-                has_medications=len(visit_data.get("medications", [])) > 0,
-                has_problems=len(visit_data.get("problem_list", [])) > 0,
-                has_results=len(visit_data.get("results", [])) > 0,
+                error=str(e),
             )
+            return
 
-            return visit_data
+        if self.cache is not None:
+            self.cache.set(chunk, visit_data)
+        accepted[chunk["visit_id"]] = visit_data
 
-        except StructuringError:
-            raise
-        except Exception as e:
-            logger.error("Structuring failed", visit_id=chunk["visit_id"], error=str(e))
-            raise StructuringError(f"Failed to structure visit {chunk['visit_id']}: {e}")
+    def _is_trivial_chunk(self, chunk: Dict[str, any]) -> bool:
+        """True when a chunk has too little OCR text to be worth a model call"""
+        text = chunk["raw_text"].strip()
+        return len(text) < self.config.structuring_min_chunk_chars or not any(c.isalnum() for c in text)
+
+    @staticmethod
+    def _insufficient_text_visit(chunk: Dict[str, any]) -> Dict[str, any]:
+        """Review-flagged empty visit for a near-empty chunk (no model call)"""
+        logger.info("Skipping structuring call for near-empty chunk", visit_id=chunk["visit_id"])
+        return {
+            "visit_id": chunk["visit_id"],
+            "raw_source_pages": chunk["pages"],
+            "manual_review_required": True,
+            "review_reasons": ["Insufficient OCR text"],
+        }
+
+    @staticmethod
+    def _placeholder_visit(chunk: Dict[str, any], error: Exception) -> Dict[str, any]:
+        """Review-flagged visit standing in for one that failed to structure"""
+        logger.warning(
+            "Visit structuring failed, adding placeholder",
+            visit_id=chunk["visit_id"],
+            error=str(error),
+        )
+        # Add minimal visit with error marker
+        return {
+            "visit_id": chunk["visit_id"],
+            "raw_source_pages": chunk["pages"],
+            "manual_review_required": True,
+            "review_reasons": [f"Structuring failed: {str(error)}"],
+        }
+
+    def _structure_or_placeholder(self, chunk: Dict[str, any]) -> Dict[str, any]:
+        """structure_visit, falling back to a review-flagged placeholder visit"""
+        try:
+            return self.structure_visit(chunk)
+        except StructuringError as e:
+            return self._placeholder_visit(chunk, e)
+
+    async def _structure_or_placeholder_async(self, chunk: Dict[str, any]) -> Dict[str, any]:
+        """structure_visit_async, falling back to a review-flagged placeholder visit"""
+        try:
+            return await self.structure_visit_async(chunk)
+        except StructuringError as e:
+            return self._placeholder_visit(chunk, e)
+
+    def _plan_batches(self, chunks: List[Dict[str, any]]) -> List[List[Dict[str, any]]]:
+        """Group consecutive chunks into batches for structure_visits_batch
+
+        Batches hold at most structuring_batch_size visits and, past the first
+        visit, stay under BATCH_TOKEN_BUDGET estimated tokens of OCR text so the
+        combined JSON fits in one response.
+        """
+        batch_size = self.config.structuring_batch_size
+        if batch_size <= 1:
+            return [[chunk] for chunk in chunks]
+
+        batches = []
+        current, current_tokens = [], 0
+        for chunk in chunks:
+            chunk_tokens = estimate_tokens(chunk["raw_text"])
+            if current and (
+                len(current) >= batch_size
+                or current_tokens + chunk_tokens > self.BATCH_TOKEN_BUDGET
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(chunk)
+            current_tokens += chunk_tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _generate_json(self, prompt: str) -> Dict:
+        """Call Gemini with the structuring settings and parse the JSON reply"""
+        return self._parse_json_text("".join(self._stream_text(prompt)))
+
+    async def _generate_json_async(self, prompt: str) -> Dict:
+        """Async counterpart of _generate_json"""
+        return self._parse_json_text("".join([piece async for piece in self._stream_text_async(prompt)]))
+
+    def _get_model(self) -> genai.GenerativeModel:
+        """Model to call, bound to the cached system prompt when context caching is on
+
+        The cached content is created on first use and recreated shortly before
+        its TTL lapses. If the API rejects it (e.g. the prompt is below the
+        model's minimum cacheable size), caching is disabled for this service
+        and calls fall back to sending the system instruction inline.
+        """
+        if not self._context_cache_enabled:
+            return self.model
+
+        with self._context_lock:
+            if self._context_model is not None and time.monotonic() < self._context_expires_at:
+                return self._context_model
+
+            ttl = self.config.structuring_context_cache_ttl_seconds
+            try:
+                cached_content = genai.caching.CachedContent.create(
+                    model=self.config.structuring_model_name,
+                    display_name=f"structuring-{PROMPT_VERSION}",
+                    system_instruction=STRUCTURING_SYSTEM_PROMPT,
+                    ttl=ttl,
+                )
+                self._context_model = genai.GenerativeModel.from_cached_content(cached_content)
+            except Exception as e:
+                logger.warning("Context caching unavailable, sending system prompt inline", error=str(e))
+                self._context_cache_enabled = False
+                self._context_model = None
+                return self.model
+
+            # Refresh a minute early so in-flight requests never hit an expired handle
+            self._context_expires_at = time.monotonic() + max(ttl - 60, 0)
+            logger.info("Structuring system prompt cached", cache_name=cached_content.name, ttl_seconds=ttl)
+            return self._context_model
+
+    def _stream_text(self, prompt: str) -> Iterator[str]:
+        """Stream the model's reply text as it is generated"""
+        self.rate_limiter.acquire()
+        response = self._get_model().generate_content(
+            prompt,
+            generation_config=GENERATION_CONFIG,
+            safety_settings=SAFETY_SETTINGS,
+            stream=True,
+        )
+
+        usage = None
+        for response_chunk in response:
+            usage = getattr(response_chunk, "usage_metadata", None) or usage
+            text = _chunk_text(response_chunk)
+            if text:
+                yield text
+        _log_usage(usage)
+
+    async def _stream_text_async(self, prompt: str) -> AsyncIterator[str]:
+        """Async counterpart of _stream_text"""
+        await self.rate_limiter.acquire_async()
+        response = await self._get_model().generate_content_async(
+            prompt,
+            generation_config=GENERATION_CONFIG,
+            safety_settings=SAFETY_SETTINGS,
+            stream=True,
+        )
+
+        usage = None
+        async for response_chunk in response:
+            usage = getattr(response_chunk, "usage_metadata", None) or usage
+            text = _chunk_text(response_chunk)
+            if text:
+                yield text
+        _log_usage(usage)
+
+    def _parse_json_text(self, response_text: str) -> Dict:
+        """Strip markdown fences from a model reply and parse it as JSON"""
+        # Remove markdown code blocks if present
+        response_text = _JSON_FENCE_RE.sub("", response_text)
+
+        try:
+            return _json_loads(response_text)
+        except json.JSONDecodeError as e:
+            logger.error("Invalid JSON from model", response=response_text[:200], error=str(e))
+            raise StructuringError(f"Model returned invalid JSON: {e}")
+
+    def _finalize_visit(self, visit_data: Dict, chunk: Dict[str, any]) -> Dict:
+        """Fill required fields from the chunk and enrich source excerpts"""
+        # Ensure required fields; missing or null string fields become ""
+        # (Pydantic v2 strict typing)
+        visit_data = {
+            "visit_id": chunk["visit_id"],
+            "raw_source_pages": chunk["pages"],
+            "visit_date": chunk.get("visit_date"),
+            **visit_data,
+            **{field: "" for field in _VISIT_TEXT_FIELDS if visit_data.get(field) is None},
+        }
+
+        # Enterprise Improvement #2: Enrich with source excerpts if missing
+        return self._enrich_source_excerpts(visit_data, chunk['raw_text'])
+
+    @staticmethod
+    def _line_numbered(raw_text: str) -> str:
+        """Prefix each OCR line with its 1-based line number"""
+        return '\n'.join(["%4d| %s" % numbered for numbered in enumerate(raw_text.split('\n'), 1)])
 
     def structure_document(
         self,
@@ -253,6 +756,9 @@ Extract structured data into JSON format. Remember:
     ) -> MedicalDocument:
         """Structure entire document from chunks
 
+        With STRUCTURING_ASYNC enabled this runs structure_document_async on a
+        fresh event loop; it must not be called from inside a running loop.
+
         Args:
             chunks: List of visit chunks from ChunkingService
             ocr_results: Original OCR results (for metadata)
@@ -263,64 +769,116 @@ Extract structured data into JSON format. Remember:
         Raises:
             StructuringError: If structuring fails
         """
+        if self.config.structuring_async:
+            return asyncio.run(self.structure_document_async(chunks, ocr_results))
+
         logger.info("Structuring document", total_visits=len(chunks))
 
+        cached_visits = self._all_cached_visits(chunks)
+        if cached_visits is not None:
+            return self._document_from_visits([cached_visits], ocr_results)
+
         try:
-            # Structure each visit
-            visits_data = []
-            for chunk in chunks:
-                try:
-                    visit_data = self.structure_visit(chunk)
-                    visits_data.append(visit_data)
-                except StructuringError as e:
-                    logger.warning(
-                        "Visit structuring failed, adding placeholder",
-                        visit_id=chunk["visit_id"],
-                        error=str(e),
-                    )
-                    # Add minimal visit with error marker
-                    visits_data.append({
-                        "visit_id": chunk["visit_id"],
-                        "raw_source_pages": chunk["pages"],
-                        "manual_review_required": True,
-                        "review_reasons": [f"Structuring failed: {str(e)}"],
-                    })
-
-            # Calculate overall confidence
-            avg_confidence = sum(
-                ocr["confidence_score"] for ocr in ocr_results
-            ) / len(ocr_results) if ocr_results else 0.0
-
-            # Combine raw OCR text from all pages for LLM-based rendering
-            raw_ocr_text = ""
-            for result in ocr_results:
-                page_num = result.get("page_number", result.get("page", 0))
-                raw_ocr_text += f"\n{'=' * 80}\n"
-                raw_ocr_text += f"PAGE {page_num}\n"
-                raw_ocr_text += f"{'=' * 80}\n\n"
-                raw_ocr_text += result.get("raw_text", result.get("text", ""))
-                raw_ocr_text += "\n\n"
-
-            # Create MedicalDocument
-            document = MedicalDocument(
-                visits=visits_data,
-                page_count=len(ocr_results),
-                ocr_confidence_avg=round(avg_confidence, 2),
-                raw_ocr_text=raw_ocr_text.strip(),  # Store complete OCR text
-            )
+            # Structure visits concurrently - each call is blocked on Gemini I/O.
+            # Results are slotted by position to keep document order.
+            batches = self._plan_batches(chunks)
+            batch_results = [None] * len(batches)
+            max_workers = max(1, min(self.config.structuring_concurrency, len(batches)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(self.structure_visits_batch, batches[index]): index
+                    for index in _largest_first(batches)
+                }
+                for future in as_completed(futures):
+                    batch_results[futures[future]] = future.result()
 
-            logger.info(
-                "Document structuring complete",
-                visits=len(visits_data),
-                avg_confidence=round(avg_confidence, 2),
-            )
+            return self._document_from_visits(batch_results, ocr_results)
+
+        except Exception as e:
+            logger.error("Document structuring failed", error=str(e))
+            raise StructuringError(f"Failed to structure document: {e}")
+
+    async def structure_document_async(
+        self,
+        chunks: List[Dict[str, any]],
+        ocr_results: List[Dict[str, any]]
+    ) -> MedicalDocument:
+        """Structure entire document from chunks on the asyncio event loop
+
+        Same result as the threaded structure_document, but the Gemini calls
+        are coroutines bounded by a semaphore of structuring_concurrency.
+
+        Args:
+            chunks: List of visit chunks from ChunkingService
+            ocr_results: Original OCR results (for metadata)
+
+        Returns:
+            Complete MedicalDocument instance
+
+        Raises:
+            StructuringError: If structuring fails
+        """
+        logger.info("Structuring document", total_visits=len(chunks), mode="async")
+
+        cached_visits = self._all_cached_visits(chunks)
+        if cached_visits is not None:
+            return self._document_from_visits([cached_visits], ocr_results)
+
+        try:
+            batches = self._plan_batches(chunks)
+            semaphore = asyncio.Semaphore(max(1, self.config.structuring_concurrency))
+
+            async def run(batch: List[Dict[str, any]]) -> List[Dict[str, any]]:
+                async with semaphore:
+                    return await self.structure_visits_batch_async(batch)
 
-            return document
+            # Tasks take the semaphore in creation order, so create them largest-first
+            tasks = {index: asyncio.create_task(run(batches[index])) for index in _largest_first(batches)}
+            batch_results = await asyncio.gather(*(tasks[index] for index in range(len(batches))))
+
+            return self._document_from_visits(batch_results, ocr_results)
 
         except Exception as e:
             logger.error("Document structuring failed", error=str(e))
             raise StructuringError(f"Failed to structure document: {e}")
 
+    def _document_from_visits(
+        self,
+        batch_results: List[List[Dict[str, any]]],
+        ocr_results: List[Dict[str, any]]
+    ) -> MedicalDocument:
+        """Assemble and validate the MedicalDocument from per-batch visits"""
+        visits_data = [visit for batch in batch_results for visit in batch]
+
+        # Calculate overall confidence
+        avg_confidence = fmean(
+            ocr["confidence_score"] for ocr in ocr_results
+        ) if ocr_results else 0.0
+
+        # Combine raw OCR text from all pages for LLM-based rendering
+        rule = "=" * 80
+        raw_ocr_text = "".join(
+            f"\n{rule}\nPAGE {result.get('page_number', result.get('page', 0))}\n{rule}\n\n"
+            f"{result.get('raw_text', result.get('text', ''))}\n\n"
+            for result in ocr_results
+        )
+
+        # Create MedicalDocument
+        document = MedicalDocument.model_validate({
+            "visits": visits_data,
+            "page_count": len(ocr_results),
+            "ocr_confidence_avg": round(avg_confidence, 2),
+            "raw_ocr_text": raw_ocr_text.strip(),  # Store complete OCR text
+        })
+
+        logger.info(
+            "Document structuring complete",
+            visits=len(visits_data),
+            avg_confidence=round(avg_confidence, 2),
+        )
+
+        return document
+
     def _enrich_source_excerpts(self, visit_data: Dict, ocr_text: str) -> Dict:
         """Enrich structured data with source excerpts if missing
 
@@ -329,55 +887,234 @@ Extract structured data into JSON format. Remember:
         - Add line number
         - Add 50-char excerpt for context
         """
+        # (item, lowercased text to find) for every item still missing traceability
+        targets = []
+        for field, text_key in (
+            ("medications", "name"),
+            ("problem_list", "problem"),
+            ("results", "test_name"),
+            ("plan", "action"),
+        ):
+            for item in visit_data.get(field, []):
+                if "source_line" not in item or "source_excerpt" not in item:
+                    text = item.get(text_key, "")
+                    if text and text != "N/A" and text != "null":
+                        targets.append((item, text.lower()))
+
+        if not targets:
+            return visit_data
+
         lines = ocr_text.split('\n')
+        first_hits = _find_first_occurrences(lines, {needle for _, needle in targets})
+
+        for item, needle in targets:
+            hit = first_hits.get(needle)
+            if hit is None:
+                continue
 
-        def find_excerpt(text_to_find: str) -> Dict[str, any]:
-            """Find text in OCR and return line number + excerpt"""
-            if not text_to_find or text_to_find == "N/A" or text_to_find == "null":
-                return {}
-
-            # Search for text in lines
-            for line_num, line in enumerate(lines, start=1):
-                if text_to_find.lower() in line.lower():
-                    # Found it! Extract 50-char context
-                    start_idx = max(0, line.lower().find(text_to_find.lower()) - 10)
-                    end_idx = min(len(line), start_idx + 60)
-                    excerpt = line[start_idx:end_idx].strip()
-
-                    return {
-                        "source_line": line_num,
-                        "source_excerpt": excerpt[:60]  # Cap at 60 chars
-                    }
-
-            # Not found - return empty
-            return {}
-
-        # Enrich medications
-        for med in visit_data.get("medications", []):
-            if "source_line" not in med or "source_excerpt" not in med:
-                med_name = med.get("name", "")
-                enrichment = find_excerpt(med_name)
-                med.update(enrichment)
-
-        # Enrich problems
-        for problem in visit_data.get("problem_list", []):
-            if "source_line" not in problem or "source_excerpt" not in problem:
-                problem_text = problem.get("problem", "")
-                enrichment = find_excerpt(problem_text)
-                problem.update(enrichment)
-
-        # Enrich results
-        for result in visit_data.get("results", []):
-            if "source_line" not in result or "source_excerpt" not in result:
-                test_name = result.get("test_name", "")
-                enrichment = find_excerpt(test_name)
-                result.update(enrichment)
-
-        # Enrich plan items
-        for plan_item in visit_data.get("plan", []):
-            if "source_line" not in plan_item or "source_excerpt" not in plan_item:
-                action = plan_item.get("action", "")
-                enrichment = find_excerpt(action)
-                plan_item.update(enrichment)
+            # Found it! Extract context (slicing caps it at 60 chars)
+            line_index, found_at = hit
+            start_idx = max(0, found_at - 10)
+            item["source_line"] = line_index + 1
+            item["source_excerpt"] = lines[line_index][start_idx:start_idx + 60].strip()
 
         return visit_data
+
+
+# Visit string fields the schema requires as str (model nulls become "")
+_VISIT_TEXT_FIELDS = ("reason_for_visit", "history_of_present_illness", "assessment")
+
+# Visit fields combined when a split visit is merged back together
+_MERGE_LIST_FIELDS = (
+    "past_medical_history", "medications", "allergies",
+    "problem_list", "results", "plan", "review_reasons",
+)
+_MERGE_FIRST_FIELDS = ("visit_date", "encounter_type", "vital_signs")
+
+
+def _merge_split_visit(chunk: Dict, parts: List[Dict], results: List[Dict]) -> Dict:
+    """Merge the structured parts of an oversized visit back into one visit"""
+    merged = None
+    line_offset = 0
+    for part, visit_data in zip(parts, results):
+        _shift_source_lines(visit_data, line_offset)
+        merged = visit_data if merged is None else _merge_visit_parts(merged, visit_data)
+        line_offset += part["raw_text"].count("\n") + 1
+
+    merged["raw_source_pages"] = chunk["pages"]
+    return merged
+
+
+def _shift_source_lines(visit_data: Dict, offset: int) -> None:
+    """Make part-relative source_line numbers relative to the whole visit"""
+    if not offset:
+        return
+    for field in ("medications", "problem_list", "results", "plan"):
+        for item in visit_data.get(field) or []:
+            if isinstance(item, dict) and isinstance(item.get("source_line"), int):
+                item["source_line"] += offset
+
+
+def _merge_visit_parts(merged: Dict, part: Dict) -> Dict:
+    """Fold one structured part of a split visit into the accumulated visit"""
+    for field in _MERGE_LIST_FIELDS:
+        if part.get(field):
+            merged[field] = (merged.get(field) or []) + part[field]
+    for field in _VISIT_TEXT_FIELDS:
+        texts = [text for text in (merged.get(field), part.get(field)) if text]
+        merged[field] = "\n".join(texts)
+    for field in _MERGE_FIRST_FIELDS:
+        if merged.get(field) is None and part.get(field) is not None:
+            merged[field] = part[field]
+    merged["manual_review_required"] = bool(
+        merged.get("manual_review_required") or part.get("manual_review_required")
+    )
+    return merged
+
+
+class _JSONArrayStream:
+    """Yield the objects of a JSON array field as they complete in a text stream
+
+    Scans incrementally for the array under `"<key>"` and tracks string/nesting
+    state, so each element can be parsed the moment its closing brace arrives.
+    """
+
+    def __init__(self, key: str):
+        self._marker = f'"{key}"'
+        self._buffer = ""
+        self._pos = 0
+        self._array_open = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+        self.items_seen = 0
+
+    def feed(self, text: str) -> List[Dict]:
+        """Add streamed text; return array elements completed by it"""
+        self._buffer += text
+        if self._done:
+            return []
+
+        buffer = self._buffer
+        if not self._array_open:
+            key_at = buffer.find(self._marker)
+            if key_at == -1:
+                return []
+            array_at = buffer.find("[", key_at + len(self._marker))
+            if array_at == -1:
+                return []
+            self._array_open = True
+            self._pos = array_at + 1
+
+        items = []
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # Closing bracket of the array itself
+                    self._done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0 and self._item_start is not None:
+                    try:
+                        item = _json_loads(buffer[self._item_start:i + 1])
+                    except json.JSONDecodeError:
+                        item = None
+                    if isinstance(item, dict):
+                        items.append(item)
+                        self.items_seen += 1
+                    self._item_start = None
+            i += 1
+
+        self._pos = i
+        return items
+
+
+def _largest_first(batches: List[List[Dict]]) -> List[int]:
+    """Batch indexes by descending OCR text size
+
+    Latency tracks output size, so starting the largest batches first keeps
+    short ones for idle workers at the tail (LPT scheduling).
+    """
+    return sorted(
+        range(len(batches)),
+        key=lambda index: sum(len(chunk["raw_text"]) for chunk in batches[index]),
+        reverse=True,
+    )
+
+
+def _chunk_text(response_chunk) -> str:
+    """Text of one streamed response chunk ("" when it carries no text parts)"""
+    try:
+        return response_chunk.text
+    except ValueError:
+        # Chunk carries no text parts (e.g. only a finish reason)
+        return ""
+
+
+def _log_usage(usage) -> None:
+    """Log token usage reported on the last streamed chunk"""
+    if usage is not None:
+        logger.debug(
+            "Structuring call usage",
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            output_tokens=getattr(usage, "candidates_token_count", None),
+        )
+
+
+def _find_first_occurrences(lines: List[str], needles: Set[str]) -> Dict[str, Tuple[int, int]]:
+    """Locate each lowercase needle's first occurrence in the OCR lines
+
+    Lines are lowercased once and joined, then searched in one Aho-Corasick
+    pass (pyahocorasick, when installed) or one C-level str.find per needle.
+    Offsets are mapped back to (line index, offset within the lowercased line).
+    Needles spanning a line break never match, as with a per-line search.
+    """
+    lines_lower = [line.lower() for line in lines]
+    joined = "\n".join(lines_lower)
+    line_starts = []
+    offset = 0
+    for line in lines_lower:
+        line_starts.append(offset)
+        offset += len(line) + 1
+
+    def locate(pos: int) -> Tuple[int, int]:
+        line_index = bisect_right(line_starts, pos) - 1
+        return line_index, pos - line_starts[line_index]
+
+    needles = {needle for needle in needles if needle and "\n" not in needle}
+    hits = {}
+
+    if ahocorasick is not None and len(needles) > 1:
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        for end, needle in automaton.iter(joined):
+            if needle not in hits:
+                hits[needle] = locate(end - len(needle) + 1)
+                if len(hits) == len(needles):
+                    break
+        return hits
+
+    for needle in needles:
+        pos = joined.find(needle)
+        if pos != -1:
+            hits[needle] = locate(pos)
+    return hits
@@ -2,10 +2,16 @@
 
 from .config import Config
 from .logger import get_logger
+from .prefetch import prefetch
+from .rate_limit import RateLimiter
 from .retry import retry_with_backoff
+from .tokens import estimate_tokens
 
 __all__ = [
     "Config",
     "get_logger",
+    "prefetch",
+    "RateLimiter",
     "retry_with_backoff",
+    "estimate_tokens",
 ]
@@ -32,9 +32,32 @@ class Config(BaseSettings):
     # OCR Configuration
     ocr_confidence_threshold: float = 0.70
     ocr_timeout_seconds: int = 30
+    ocr_concurrency: int = 4  # Parallel page OCR calls
+    ocr_requests_per_minute: int = 0  # 0 = no client-side pacing
+    ocr_batch_size: int = 1  # Pages per OCR call (1 = one call per page)
+    ocr_max_output_tokens: int = 8192  # Model's output-token limit; caps batched OCR replies
+    ocr_prefetch_pages: int = 4  # Pages rasterized ahead of OCR (bounds memory)
+    ocr_cache_enabled: bool = False  # Opt-in: writes OCR text (PHI) to <cache_dir>/ocr.sqlite3
+    ocr_cache_ttl_seconds: int = 7 * 24 * 3600
+    ocr_max_image_dimension: int = 1024  # Longest side (px) of uploaded pages; 0 = full size
+    ocr_jpeg_quality: int = 85
+    ocr_full_resolution_below_confidence: float = 0.6  # Re-OCR downscaled pages below this at full size
 
     # Structuring Configuration
     structuring_timeout_seconds: int = 120
+    structuring_concurrency: int = 4  # Parallel visit structuring calls
+    structuring_requests_per_minute: int = 0  # 0 = no client-side pacing
+    structuring_async: bool = False  # asyncio instead of a thread pool for structuring calls
+    structuring_batch_size: int = 1  # Visits per Gemini call (1 = one call per visit)
+    structuring_max_input_tokens: int = 32000  # Larger visits are split on line boundaries
+    structuring_min_chunk_chars: int = 80  # Shorter chunks skip the model call
+    structuring_context_cache_enabled: bool = False  # Gemini cached content for the system prompt
+    structuring_context_cache_ttl_seconds: int = 3600
+    structuring_cache_enabled: bool = False  # Opt-in: writes visits (PHI) to <cache_dir>/structuring.sqlite3
+    structuring_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # Cache Configuration (holds PHI - keep on the same protected volume as outputs)
+    cache_dir: str = ".cache"  # Relative paths resolve against the working directory
 
     @property
     def max_file_size_bytes(self) -> int:
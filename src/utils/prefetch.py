@@ -0,0 +1,55 @@
+"""Background prefetching for pipeline stages
+
+Lets a producer stage (e.g. page rasterization) run ahead of its consumer
+(OCR) on a separate thread, through a bounded queue so memory stays capped.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def prefetch(iterable: Iterable[T], maxsize: int = 4) -> Iterator[T]:
+    """Iterate `iterable` on a background thread, buffering up to maxsize items
+
+    Items are yielded in order. An exception raised by the producer is
+    re-raised in the consumer; closing the returned generator early stops
+    the producer at its next item.
+    """
+    buffer = queue.Queue(maxsize=max(1, maxsize))
+    stopped = threading.Event()
+
+    def put(entry) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put((True, item)):
+                    return
+        except Exception as e:
+            put((False, e))
+            return
+        put((False, None))
+
+    threading.Thread(target=produce, name="prefetch", daemon=True).start()
+
+    try:
+        while True:
+            ok, value = buffer.get()
+            if ok:
+                yield value
+            elif value is None:
+                return
+            else:
+                raise value
+    finally:
+        stopped.set()
@@ -0,0 +1,43 @@
+"""Request pacing for concurrent API calls"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Space out calls so at most `requests_per_minute` start per minute
+
+    Thread-safe: concurrent workers each call acquire() (or, on an event loop,
+    acquire_async()) before hitting the API and are released one interval
+    apart. A limit of 0 disables pacing.
+    """
+
+    def __init__(self, requests_per_minute: int = 0):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller's request slot is due"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait (without blocking the event loop) until the caller's slot is due"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _reserve(self) -> float:
+        """Claim the next request slot; seconds until it is due"""
+        if not self.interval:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        return slot - now
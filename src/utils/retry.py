@@ -1,5 +1,8 @@
 """Retry utilities with exponential backoff"""
 
+import asyncio
+import inspect
+import random
 import time
 from functools import wraps
 from typing import Any, Callable, Optional, Tuple, Type
@@ -8,6 +11,46 @@ from .logger import get_logger
 
 logger = get_logger(__name__)
 
+# Errors worth retrying on Gemini calls: overload, rate limiting, timeouts
+try:
+    from google.api_core import exceptions as api_exceptions
+
+    TRANSIENT_API_ERRORS: Tuple[Type[Exception], ...] = (
+        api_exceptions.ResourceExhausted,
+        api_exceptions.ServiceUnavailable,
+        api_exceptions.DeadlineExceeded,
+        api_exceptions.InternalServerError,
+        ConnectionError,
+        TimeoutError,
+    )
+except ImportError:
+    TRANSIENT_API_ERRORS = (ConnectionError, TimeoutError)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested wait carried by an API error, if any
+
+    Checks a retry_delay attribute, google.rpc.RetryInfo entries in the
+    error details, and an HTTP Retry-After header, in that order.
+    """
+    candidates = [getattr(error, "retry_delay", None)]
+    candidates += [getattr(d, "retry_delay", None) for d in getattr(error, "details", None) or []]
+    for retry_delay in candidates:
+        if retry_delay is None:
+            continue
+        if hasattr(retry_delay, "total_seconds"):
+            return retry_delay.total_seconds()
+        if hasattr(retry_delay, "seconds"):
+            return retry_delay.seconds + getattr(retry_delay, "nanos", 0) / 1e9
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers:
+        try:
+            return float(headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            pass
+    return None
+
 
 def retry_with_backoff(
     max_retries: int = 3,
@@ -18,6 +61,12 @@ def retry_with_backoff(
 ):
     """Decorator for exponential backoff retry logic
 
+    Waits use full jitter - a random delay up to the exponential backoff cap -
+    so concurrent callers do not retry in lockstep. A server-provided retry
+    delay (RetryInfo / Retry-After) takes precedence when present, clamped to
+    0..max_delay. Coroutine
+    functions get an async wrapper that waits with asyncio.sleep.
+
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay in seconds
@@ -31,42 +80,63 @@ def retry_with_backoff(
     if retryable_exceptions is None:
         retryable_exceptions = (Exception,)
 
+    def next_delay(func: Callable, error: Exception, attempt: int) -> Optional[float]:
+        """Log a failed attempt; seconds to wait before the next, or None when out of retries"""
+        if attempt == max_retries:
+            logger.error(
+                "Max retries exceeded",
+                function=func.__name__,
+                attempts=attempt + 1,
+                error=str(error),
+            )
+            return None
+
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            # Bounded like the backoff path; a bad server value must not stall workers
+            delay = min(max(retry_after, 0.0), max_delay)
+        else:
+            cap = min(max_delay, initial_delay * (backoff_multiplier ** attempt))
+            delay = random.uniform(0, cap)
+
+        logger.warning(
+            "Retry attempt",
+            function=func.__name__,
+            attempt=attempt + 1,
+            max_retries=max_retries,
+            delay=round(delay, 2),
+            error=str(error),
+        )
+        return delay
+
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except retryable_exceptions as e:
+                        delay = next_delay(func, e, attempt)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+                raise RuntimeError("Unexpected retry loop termination")
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            delay = initial_delay
-            last_exception = None
-
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
                 except retryable_exceptions as e:
-                    last_exception = e
-
-                    if attempt == max_retries:
-                        logger.error(
-                            "Max retries exceeded",
-                            function=func.__name__,
-                            attempts=attempt + 1,
-                            error=str(e),
-                        )
+                    delay = next_delay(func, e, attempt)
+                    if delay is None:
                         raise
-
-                    logger.warning(
-                        "Retry attempt",
-                        function=func.__name__,
-                        attempt=attempt + 1,
-                        max_retries=max_retries,
-                        delay=delay,
-                        error=str(e),
-                    )
-
                     time.sleep(delay)
-                    delay = min(delay * backoff_multiplier, max_delay)
 
             # Should never reach here, but for type safety
-            if last_exception:
-                raise last_exception
             raise RuntimeError("Unexpected retry loop termination")
 
         return wrapper
@@ -0,0 +1,41 @@
+"""Local prompt token estimation
+
+Sizes prompts before they are sent, without a count_tokens round trip to the
+API. Uses tiktoken's cl100k_base encoding when installed; Gemini's tokenizer
+differs, so treat results as estimates either way. Without tiktoken, falls
+back to the common ~4 characters per token heuristic.
+
+The encoding is loaded on the first estimate, not at import: tiktoken
+downloads its BPE file on first use unless it is already cached. Offline hosts
+should pre-populate TIKTOKEN_CACHE_DIR or leave tiktoken uninstalled.
+"""
+
+from functools import lru_cache
+
+# Optional: closer token counts (pip install tiktoken)
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Average characters per token for the fallback heuristic
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _get_encoding():
+    """cl100k_base encoding, or None when tiktoken or its BPE file is unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # The encoding file could not be fetched
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
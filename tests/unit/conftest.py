@@ -0,0 +1,32 @@
+"""Shared fixtures for the renderer unit tests"""
+
+import re
+from datetime import datetime
+
+import pytest
+
+from src.models.canonical_schema import MedicalDocument, DocumentMetadata
+
+
+# Document and organizer IDs vary per render (timestamps or random hex)
+RENDER_IDS = re.compile(r'extension="(doc|results_org)_[0-9a-f]+"')
+
+
+@pytest.fixture
+def make_document():
+    """Factory for a MedicalDocument with a fixed processed_at"""
+    def make(metadata=None, visits=None):
+        document = MedicalDocument(
+            document_metadata=metadata or DocumentMetadata(),
+            processed_at=datetime(2024, 5, 6, 7, 8, 9),
+        )
+        document.visits = visits or []
+        return document
+
+    return make
+
+
+@pytest.fixture
+def normalize_xml():
+    """Strip per-render IDs so two renders of a document compare equal"""
+    return lambda xml: RENDER_IDS.sub("", xml)
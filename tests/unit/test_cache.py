@@ -0,0 +1,27 @@
+"""Unit tests for the SQLite-backed cache"""
+
+from src.utils.cache import SQLiteCache
+
+
+class TestSQLiteCache:
+    """Test SQLiteCache get/set/expiry"""
+
+    def test_round_trip(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+        cache.set("k", {"visit_id": "visit_001", "plan": [{"action": "Follow up"}]})
+        assert cache.get("k") == {"visit_id": "visit_001", "plan": [{"action": "Follow up"}]}
+        assert cache.get("missing") is None
+
+    def test_expired_entry_is_dropped(self, tmp_path, monkeypatch):
+        cache = SQLiteCache(str(tmp_path / "cache.sqlite3"))
+        cache.set("k", "v", expire=10)
+
+        import src.utils.cache as cache_module
+        real_time = cache_module.time.time
+        monkeypatch.setattr(cache_module.time, "time", lambda: real_time() + 11)
+        assert cache.get("k") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        SQLiteCache(path).set("k", [1, 2, 3])
+        assert SQLiteCache(path).get("k") == [1, 2, 3]
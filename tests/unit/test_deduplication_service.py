@@ -0,0 +1,37 @@
+"""Unit tests for deduplication merge decisions"""
+
+import pytest
+
+from src.services.deduplication_service import DeduplicationService
+
+
+class TestFuzzyMerge:
+    """Merge decisions use SequenceMatcher ratios with or without rapidfuzz"""
+
+    @pytest.mark.parametrize("name1,name2,merged", [
+        ("Metformin 500mg", "Metformin 500 mg", True),
+        ("Lisinopril 10 mg", "lisinopril 20 mg", True),
+        # SequenceMatcher ratio 0.52; rapidfuzz's Indel ratio would be 0.96
+        ("bac bbbac bba", "bac bbabac bba", False),
+        ("Metformin", "Atorvastatin", False),
+    ])
+    def test_merge_medications(self, name1, name2, merged):
+        service = DeduplicationService(fuzzy_threshold=0.85)
+        result = service.merge_medications([
+            {"name": name1, "source_page": 1},
+            {"name": name2, "source_page": 2},
+        ])
+        assert len(result) == (1 if merged else 2)
+
+    def test_batch_matches_pairwise_similarity(self):
+        service = DeduplicationService(fuzzy_threshold=0.85)
+        texts = ["bac bbbac bba", "bac bbabac bba", "Metformin 500mg", "metformin 500 mg", ""]
+        similarity_of = service._pairwise_similarity(texts)
+
+        for i in range(len(texts)):
+            for j in range(len(texts)):
+                is_match, expected = service.is_fuzzy_match(texts[i], texts[j])
+                similarity = similarity_of(i, j)
+                assert (similarity >= service.fuzzy_threshold) == is_match
+                if is_match:
+                    assert similarity == pytest.approx(expected)
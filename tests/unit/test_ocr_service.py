@@ -0,0 +1,72 @@
+"""Unit tests for batched OCR reply handling (no API calls)"""
+
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+from src.services import ocr_service
+from src.services.ocr_service import OCRError, OCRService
+from src.utils.rate_limit import RateLimiter
+
+
+class _StubModel:
+    """Stands in for both the genai client and the legacy model"""
+
+    def __init__(self, text, finish_reason):
+        self.response = SimpleNamespace(
+            text=text,
+            candidates=[SimpleNamespace(finish_reason=finish_reason)],
+        )
+        self.models = self
+        self.calls = []
+
+    def generate_content(self, *args, **kwargs):
+        self.calls.append(kwargs)
+        return self.response
+
+
+def _service(text, finish_reason, max_output_tokens=65536):
+    service = OCRService.__new__(OCRService)
+    service.config = SimpleNamespace(
+        ocr_max_image_dimension=64,
+        ocr_jpeg_quality=85,
+        ocr_max_output_tokens=max_output_tokens,
+    )
+    service.model_name = "stub"
+    service.rate_limiter = RateLimiter(0)
+    service.client = service.model = _StubModel(text, finish_reason)
+    if ocr_service.USING_NEW_API:
+        service.generation_config = ocr_service.types.GenerateContentConfig(max_output_tokens=8192)
+    else:
+        service.generation_config = ocr_service.genai.GenerationConfig(max_output_tokens=8192)
+    return service
+
+
+PAGES = [(1, Image.new("RGB", (32, 32), "white")), (2, Image.new("RGB", (32, 32), "white"))]
+REPLY = "### PAGE 1 ###\nPatient: Jane Doe, BP 120/80\n### PAGE 2 ###\nMetformin 500 mg tw"
+
+
+class TestExtractTextFromImages:
+    """Batched replies are split per page; truncated pages are left out"""
+
+    def test_complete_reply_returns_every_page(self):
+        results = _service(REPLY, "STOP").extract_text_from_images(PAGES)
+        assert sorted(results) == [1, 2]
+        assert results[2]["raw_text"] == "Metformin 500 mg tw"
+
+    def test_truncated_reply_drops_last_page(self):
+        results = _service(REPLY, "MAX_TOKENS").extract_text_from_images(PAGES)
+        assert sorted(results) == [1]
+
+    def test_truncated_single_section_fails_batch(self):
+        service = _service("### PAGE 1 ###\nPatient: Jane", "MAX_TOKENS")
+        with pytest.raises(OCRError):
+            service.extract_text_from_images.__wrapped__(service, PAGES)
+
+    def test_output_budget_capped_at_model_limit(self):
+        service = _service(REPLY, "STOP", max_output_tokens=10000)
+        service.extract_text_from_images(PAGES)
+        call = service.model.calls[0]
+        config = call.get("config") or call.get("generation_config")
+        assert config.max_output_tokens == 10000
@@ -0,0 +1,91 @@
+"""Unit tests for retry_with_backoff"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import retry as retry_module
+from src.utils.retry import retry_with_backoff
+
+
+class _Throttled(Exception):
+    """Error carrying an HTTP Retry-After header"""
+
+    def __init__(self, retry_after):
+        super().__init__("429")
+        self.response = SimpleNamespace(headers={"Retry-After": retry_after})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested waits instead of sleeping"""
+    waits = []
+
+    async def fake_async_sleep(delay):
+        waits.append(delay)
+
+    monkeypatch.setattr(retry_module.time, "sleep", waits.append)
+    monkeypatch.setattr(retry_module.asyncio, "sleep", fake_async_sleep)
+    return waits
+
+
+def _flaky(errors):
+    """Function raising each error in turn, then returning "ok" """
+    errors = list(errors)
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return call
+
+
+class TestRetryAfter:
+    """Server-requested waits are used but clamped to 0..max_delay"""
+
+    @pytest.mark.parametrize("retry_after,expected", [
+        ("3", 3.0),
+        ("3600", 10.0),
+        ("-5", 0.0),
+    ])
+    def test_retry_after_is_clamped(self, sleeps, retry_after, expected):
+        call = retry_with_backoff(max_retries=1, max_delay=10.0)(_flaky([_Throttled(retry_after)]))
+        assert call() == "ok"
+        assert sleeps == [expected]
+
+    def test_jittered_backoff_without_retry_after(self, sleeps):
+        call = retry_with_backoff(max_retries=3, initial_delay=1.0)(
+            _flaky([ValueError(), ValueError(), ValueError()])
+        )
+        assert call() == "ok"
+        assert len(sleeps) == 3
+        assert all(0 <= wait <= cap for wait, cap in zip(sleeps, (1.0, 2.0, 4.0)))
+
+    def test_gives_up_after_max_retries(self, sleeps):
+        call = retry_with_backoff(max_retries=1)(_flaky([ValueError("a"), ValueError("b")]))
+        with pytest.raises(ValueError, match="b"):
+            call()
+        assert len(sleeps) == 1
+
+    def test_non_retryable_error_is_not_retried(self, sleeps):
+        call = retry_with_backoff(retryable_exceptions=(KeyError,))(_flaky([ValueError()]))
+        with pytest.raises(ValueError):
+            call()
+        assert sleeps == []
+
+
+class TestAsyncRetry:
+    """Coroutine functions retry with asyncio.sleep"""
+
+    def test_async_wrapper_retries(self, sleeps):
+        flaky = _flaky([_Throttled("2"), _Throttled("-1")])
+
+        @retry_with_backoff(max_retries=2, max_delay=10.0)
+        async def call():
+            return flaky()
+
+        assert asyncio.iscoroutinefunction(call)
+        assert asyncio.run(call()) == "ok"
+        assert sleeps == [2.0, 0.0]
@@ -0,0 +1,27 @@
+"""Unit tests for structuring service helpers (no API calls)"""
+
+import json
+
+from src.services.structuring_service import _JSONArrayStream
+
+
+class TestJSONArrayStream:
+    """Test incremental extraction of the visits array"""
+
+    def test_yields_items_as_they_complete(self):
+        visits = [
+            {"visit_id": "visit_001", "assessment": 'quoted "}" brace'},
+            {"visit_id": "visit_002", "plan": [{"action": "Recheck [labs]"}]},
+        ]
+        text = "```json\n" + json.dumps({"visits": visits}) + "\n```"
+        first_end = text.index("}, {") + 1
+
+        scanner = _JSONArrayStream("visits")
+        assert scanner.feed(text[:first_end]) == [visits[0]]
+        assert scanner.feed(text[first_end:]) == [visits[1]]
+        assert scanner.items_seen == 2
+
+    def test_ignores_text_without_array(self):
+        scanner = _JSONArrayStream("visits")
+        assert scanner.feed('{"visit_id": "visit_001"}') == []
+        assert scanner.items_seen == 0
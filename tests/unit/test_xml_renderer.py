@@ -0,0 +1,67 @@
+"""Unit tests for the CCD XML renderer"""
+
+from datetime import date
+
+import pytest
+
+from src.models.canonical_schema import DocumentMetadata
+from src.renderers.xml_renderer import XMLRenderer
+
+
+FULL_VISIT = {
+    "visit_id": "visit_001",
+    "visit_date": "2024-01-15",
+    "reason_for_visit": 'Polyuria & "thirst" <2 weeks>',
+    "history_of_present_illness": "Line one\nLine two",
+    "problem_list": [{"problem": "Diabetes", "icd10_code": "E11.9", "source_page": 1}],
+    "medications": [
+        {"name": "Metformin", "dose": "500 mg", "frequency": "BID", "route": "PO", "source_page": 2},
+        {"name": "Insulin <glargine>", "dose": None, "source_page": 2},
+    ],
+    "vital_signs": {"bp": {"value": "120/80", "unit": "mmHg"}, "hr": {"value": None}},
+    "results": [
+        {"test_name": "A1c", "value": 7.1, "unit": "%", "abnormal_flag": "high", "source_page": 3},
+        {"test_name": "Sodium & Na", "value": "140"},
+    ],
+    "assessment": "Assessment text",
+    "plan": [{"action": "Follow up", "category": "follow-up", "source_page": 3}],
+}
+
+
+class TestRenderToFile:
+    """render_to_file must write exactly the render() output"""
+
+    @pytest.mark.parametrize("metadata,visits", [
+        (None, None),
+        (
+            DocumentMetadata(
+                patient_name="John Q Public",
+                patient_id="MRN&1",
+                dob=date(1980, 1, 2),
+                sex="F",
+            ),
+            [FULL_VISIT, {"visit_id": "visit_002", "assessment": "Only assessment"}],
+        ),
+    ])
+    def test_matches_render(self, metadata, visits, make_document, normalize_xml, tmp_path):
+        document = make_document(metadata, visits)
+        renderer = XMLRenderer()
+        output_path = tmp_path / "ccd.xml"
+
+        assert renderer.render_to_file(document, str(output_path)) == str(output_path)
+        written = output_path.read_text(encoding="utf-8")
+        assert normalize_xml(written) == normalize_xml(renderer.render(document))
+
+
+class TestTableCells:
+    """Table cells for optional values"""
+
+    @pytest.mark.parametrize("entry,expected", [
+        ({"source_page": 0}, "0"),
+        ({"source_page": 3}, "3"),
+        ({"source_page": None}, "N/A"),
+        ({"source_page": ""}, "N/A"),
+        ({}, "N/A"),
+    ])
+    def test_page_cell(self, entry, expected):
+        assert XMLRenderer._page_cell(entry) == expected
@@ -0,0 +1,48 @@
+"""Unit tests for the Practice Fusion XML renderer"""
+
+import pytest
+
+from src.models.canonical_schema import DocumentMetadata
+from src.renderers.xml_renderer_v2 import XMLRenderer
+
+
+RENDERER = XMLRenderer()
+
+FULL_VISIT = {
+    "visit_id": "visit_001",
+    "visit_date": "2024-01-15T09:30:00",
+    "reason_for_visit": 'Polyuria & "thirst" <2 weeks>',
+    "history_of_present_illness": "HPI text",
+    "problem_list": [{"problem": "Polyuria"}, {"problem": "Something odd"}, {"problem": ""}],
+    "results": [
+        {"test_name": "Glucose", "value": "110", "unit": "mg/dL", "abnormal_flag": "high"},
+        {"test_name": "Sodium <Na>", "value": 140, "unit": ""},
+        {"test_name": "Urine Specific Gravity", "value": "1.005", "abnormal_flag": "normal"},
+    ],
+    "assessment": "Assessment text",
+    "plan": [{"action": "Follow up in 2 weeks"}, {"action": ""}],
+}
+
+
+class TestRenderBytes:
+    """render_bytes returns the UTF-8 encoding of render()"""
+
+    def test_render_bytes_is_encoded_render(self, make_document, normalize_xml):
+        document = make_document(DocumentMetadata(organization="Clínica Ñandú"), [FULL_VISIT])
+        xml_bytes = RENDERER.render_bytes(document)
+        assert isinstance(xml_bytes, bytes)
+        assert normalize_xml(xml_bytes.decode("utf-8")) == normalize_xml(RENDERER.render(document))
+
+
+class TestParseName:
+    """Test splitting patient names into given/family"""
+
+    @pytest.mark.parametrize("full_name,expected", [
+        ("John Q Public", {"given": "John Q", "family": "Public"}),
+        ("Cher", {"given": "", "family": "Cher"}),
+        ("  Jane Doe ", {"given": "Jane", "family": "Doe"}),
+        ("Mary  Ann\nSmith", {"given": "Mary Ann", "family": "Smith"}),
+        ("", {"given": "", "family": ""}),
+    ])
+    def test_parse_name(self, full_name, expected):
+        assert RENDERER._parse_name(full_name) == expected